@@ -2,10 +2,12 @@ import json
 from pathlib import Path
 from datetime import datetime, date
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 
 # Budgets (normalized keys)
 BUDGETS = {
@@ -17,6 +19,10 @@ BUDGETS = {
 
 DATA_PATH = Path(__file__).parent / "sample.json"
 
+# Seeded generator for the simulated sections; the script re-executes on every
+# rerun, so the simulated tables stay stable across widget interactions
+RNG = np.random.default_rng(42)
+
 @st.cache_data
 def load_data():
     if not DATA_PATH.exists():
@@ -32,6 +38,44 @@ def load_data():
     return df
 
 
+@st.cache_resource
+def load_static_tables():
+    # Simulated reference tables; built once per process instead of on every rerun
+    amendment_history = [
+        {"Date": "2025-11-15", "Group": "Parts", "Change": "+$15,000", "Reason": "Equipment upgrade", "Approved By": "CFO"},
+        {"Date": "2025-11-08", "Group": "GroupC", "Change": "-$5,000", "Reason": "Project delay", "Approved By": "Director"},
+        {"Date": "2025-10-22", "Group": "GroupA", "Change": "+$8,000", "Reason": "Additional resources", "Approved By": "Manager"},
+    ]
+    roi_data = [
+        {"Group": "GroupA", "Investment": "$45,000", "Revenue Impact": "$180,000", "ROI": "300%", "Payback": "3 months"},
+        {"Group": "GroupB", "Investment": "$38,000", "Revenue Impact": "$152,000", "ROI": "280%", "Payback": "3.2 months"},
+        {"Group": "GroupC", "Investment": "$52,000", "Revenue Impact": "$156,000", "ROI": "200%", "Payback": "4 months"},
+        {"Group": "Parts", "Investment": "$285,000", "Revenue Impact": "$855,000", "ROI": "200%", "Payback": "4 months"},
+    ]
+    calendar_data = {
+        "Week 1": {"Planned": 25, "Actual": 30, "Status": "🟡"},
+        "Week 2": {"Planned": 25, "Actual": 28, "Status": "🟡"},
+        "Week 3": {"Planned": 25, "Actual": 22, "Status": "🟢"},
+        "Week 4": {"Planned": 25, "Actual": 20, "Status": "🟢"}
+    }
+    constraints = [
+        {"Resource": "Budget Capacity", "Utilization": "78%", "Constraint Level": "🟢 Low", "Impact": "Minimal"},
+        {"Resource": "Approval Bandwidth", "Utilization": "92%", "Constraint Level": "🟡 Medium", "Impact": "Delays possible"},
+        {"Resource": "Vendor Capacity", "Utilization": "85%", "Constraint Level": "🟡 Medium", "Impact": "Lead time increase"},
+        {"Resource": "Internal Resources", "Utilization": "95%", "Constraint Level": "🔴 High", "Impact": "Process bottleneck"}
+    ]
+
+    cal_df = pd.DataFrame(calendar_data).T.reset_index()
+    cal_df.columns = ["Period", "Planned %", "Actual %", "Status"]
+
+    return {
+        "amendments": pd.DataFrame(amendment_history),
+        "roi": pd.DataFrame(roi_data),
+        "calendar": cal_df,
+        "constraints": pd.DataFrame(constraints),
+    }
+
+
 def get_month_bounds(ref_date: date):
     start = date(ref_date.year, ref_date.month, 1)
     # next month
@@ -56,20 +100,47 @@ def filter_month(df: pd.DataFrame, which: str):
         mask = (df["Date"] >= cur_start) & (df["Date"] < cur_next)
     else:
         mask = (df["Date"] >= prev_start) & (df["Date"] < prev_next)
-    out = df.loc[mask].copy()
+    # Stable date order lets trailing-window lookups binary-search instead of masking
+    out = df.loc[mask].sort_values("Date", kind="mergesort").reset_index(drop=True)
     out["Day"] = pd.to_datetime(out["Date"]).dt.day
+    # Categorical group and part names: equality masks and groupbys compare integer codes
+    for col in ("Group Name", "Part Name"):
+        out[col] = out[col].astype("category")
     return out
 
 
 def build_daily_group_usage(df: pd.DataFrame) -> pd.DataFrame:
     # Sum by day + group
     grouped = (
-        df.groupby(["Day", "Group Key", "Group Name"], as_index=False)["Amount"].sum()
+        df.groupby(["Day", "Group Key", "Group Name"], as_index=False, observed=True)["Amount"].sum()
         .sort_values(["Day", "Group Key"])
     )
     return grouped
 
 
+def build_derived(filtered: pd.DataFrame, daily_usage: pd.DataFrame) -> dict:
+    # Per-group lookups shared by the dashboard sections
+    groups = daily_usage["Group Name"].unique().tolist()
+    # Group Key is derived from Group Name at load time, so resolve each budget once
+    budget_by_name = {name: BUDGETS.get(name.strip().lower(), 0) for name in groups}
+    actuals_by_group = filtered.groupby("Group Name", observed=True)["Amount"].sum()
+    # Budgets, spend and utilisation aligned with groups for vectorised comparisons
+    budgets_arr = np.fromiter((budget_by_name[name] for name in groups), dtype=np.float64, count=len(groups))
+    spent_arr = actuals_by_group.reindex(groups, fill_value=0).to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        util_arr = np.where(budgets_arr > 0, spent_arr / budgets_arr * 100, 0.0)
+    return {
+        "groups": groups,
+        "budget_by_name": budget_by_name,
+        "actuals_by_group": actuals_by_group,
+        "active_days_by_group": daily_usage["Group Name"].value_counts(),
+        "budgets_arr": budgets_arr,
+        "spent_arr": spent_arr,
+        "util_arr": util_arr,
+        "over_budget_mask": spent_arr > budgets_arr,
+    }
+
+
 def build_expected_daily(df: pd.DataFrame) -> pd.DataFrame:
     # Expected usage: allocate monthly budget evenly per day up to last day present in filtered df
     if df.empty:
@@ -91,12 +162,143 @@ def build_expected_daily(df: pd.DataFrame) -> pd.DataFrame:
     return exp
 
 
+def score_groups(actuals, budgets, means, stds, counts):
+    # Efficiency scores (0-100 scale) for every group at once; inputs are aligned ndarrays
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(budgets > 0, np.minimum(100, actuals / budgets * 100), 0)
+        consistency = np.where(counts > 1, np.maximum(0, 100 - stds / means * 100), 100)
+    timing = np.full(len(actuals), 85.0)  # Simulated based on spending distribution
+
+    composite = utilization * 0.4 + consistency * 0.3 + timing * 0.3
+    # 0-3 bucket index for <70, 70-80, 80-90, >=90
+    grade = np.array(["D", "C", "B", "A"])[np.digitize(composite, [70, 80, 90])]
+    return utilization, consistency, timing, composite, grade
+
+
+def project_groups(spent, budgets, active_days, month_days=30):
+    # Month-end forecast for every group at once; inputs are aligned ndarrays
+    remaining = budgets - spent
+    days_left = month_days - active_days
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = np.where(active_days > 0, spent / active_days, 0.0)
+        runway = np.where((daily > 0) & (remaining > 0), remaining / daily, 0.0)
+        projected_total = spent + daily * days_left
+        projected_util = np.where(budgets > 0, projected_total / budgets * 100, 0.0)
+    # 0 = no projection, 1 = within budget, 2 = will exceed budget
+    status = np.where((days_left > 0) & (daily > 0), np.where(projected_util > 100, 2, 1), 0)
+    return daily, runway, days_left, projected_total, projected_util, status
+
+
+# Severity action messages indexed by the codes from plan_actions
+SEVERITY_ACTIONS = (
+    None,
+    "🟡 **MONITOR**: Approve only critical expenses",
+    "🔴 **URGENT**: Review and halt non-essential spending",
+)
+
+
+def plan_actions(util, daily, remaining, days_left, large_counts):
+    # Action-item flags for every group at once; inputs are aligned ndarrays
+    # 0 = none, 1 = monitor, 2 = urgent
+    severity = np.select([util > 100, util > 85], [2, 1], default=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        recommended = np.where(days_left > 0, remaining / days_left, 0.0)
+    review = large_counts > 0
+    reduce = (daily > 0) & (recommended < daily * 0.8)
+    on_track = (severity == 0) & ~review & ~reduce
+    return severity, review, reduce, on_track, recommended
+
+
+def show_chart(fig, static: bool = False):
+    # Full-width chart without the mode bar; static charts also skip hover/zoom handling
+    st.plotly_chart(fig, width="stretch", config={"displayModeBar": False, "staticPlot": static})
+
+
+@st.cache_data(show_spinner=False)
+def compute_summary(filtered: pd.DataFrame, group_totals: pd.Series, budget_by_name: dict) -> dict:
+    # Executive-summary aggregates, memoised on the filtered slice and budgets so
+    # reruns with unchanged filters skip the pandas passes entirely
+    total_spent = filtered["Amount"].sum()
+    # filtered is date-sorted (see filter_month), so distinct days are the value changes + 1
+    date_arr = filtered["Date"].to_numpy(dtype="datetime64[D]")
+    n_days = int(np.count_nonzero(np.diff(date_arr))) + 1 if len(date_arr) else 0
+    burn_rate = total_spent / n_days if n_days > 0 else 0
+
+    # Over-budget and most-efficient groups from aligned budget/spend arrays
+    names = np.array(list(budget_by_name), dtype=object)
+    budgets = np.fromiter(budget_by_name.values(), dtype=float, count=len(names))
+    spent = group_totals.reindex(names, fill_value=0.0).to_numpy(dtype=float)
+    over_budget_groups = names[spent > budgets].tolist()
+    efficient = (budgets > 0) & (spent > 0)
+    most_efficient = None
+    best_efficiency = float("inf")
+    if efficient.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency_pct = np.where(efficient, spent / budgets * 100, np.inf)
+        best = int(efficiency_pct.argmin())
+        most_efficient = names[best]
+        best_efficiency = float(efficiency_pct[best])
+
+    # Recent 3-day spending average
+    recent_avg = None
+    if len(filtered) > 1:
+        recent_amounts = filtered["Amount"].to_numpy()[np.searchsorted(date_arr, date_arr[-1] - np.timedelta64(3, "D")):]
+        recent_avg = recent_amounts.sum() / 3 if len(recent_amounts) > 0 else 0
+
+    # Top spending group from one argmax over the per-group totals
+    top_group, top_group_amount = "N/A", 0
+    if not group_totals.empty:
+        totals = group_totals.to_numpy()
+        top = int(totals.argmax())
+        top_group, top_group_amount = group_totals.index[top], totals[top]
+
+    return {
+        "total_spent": total_spent,
+        "n_days": n_days,
+        "burn_rate": burn_rate,
+        "top_group": top_group,
+        "top_group_amount": top_group_amount,
+        "over_budget_groups": over_budget_groups,
+        "most_efficient": most_efficient,
+        "best_efficiency": best_efficiency,
+        "recent_avg": recent_avg,
+    }
+
+
+@st.cache_data(show_spinner=False)
+def group_trends_figure_json(daily_usage: pd.DataFrame) -> str:
+    # One faceted trend figure for every group; cached as serialised figure JSON.
+    # Days without spend are filled with zeros so each line shows the gaps.
+    daily_all = daily_usage.pivot_table(
+        index="Day", columns="Group Name", values="Amount", aggfunc="sum", observed=True
+    )
+    days = range(int(daily_all.index.min()), int(daily_all.index.max()) + 1)
+    daily_all = daily_all.reindex(days).fillna(0.0).stack().rename("Amount").reset_index()
+
+    fig_trend = px.line(
+        daily_all,
+        x='Day',
+        y='Amount',
+        color='Group Name',
+        facet_col='Group Name',
+        facet_col_wrap=3,
+        category_orders={"Group Name": daily_usage["Group Name"].unique().tolist()},
+        markers=True,
+        title='Daily Spending Trend by Group'
+    )
+    fig_trend.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig_trend.update_yaxes(tickformat='$,.0f')
+    fig_trend.update_layout(showlegend=False)
+    return fig_trend.to_json()
+
+
 def main():
     st.set_page_config(page_title="Budget Usage Dashboard", layout="wide")
     st.title("Company Parts Budget Usage")
     st.caption("Displays money spent for current/previous month from sample.json")
 
     df = load_data()
+    static_tables = load_static_tables()
 
     # Controls
     option = st.selectbox(
@@ -115,7 +317,7 @@ def main():
     # Budget comparison by group
     if not filtered.empty:
         st.subheader(f"1. Budget vs Actual – {option}")
-        group_spending = filtered.groupby(["Group Key", "Group Name"])["Amount"].sum().reset_index()
+        group_spending = filtered.groupby(["Group Key", "Group Name"], observed=True)["Amount"].sum().reset_index()
         
         comparison_data = []
         for _, row in group_spending.iterrows():
@@ -153,7 +355,26 @@ def main():
     else:
         # Cumulative Step Line Charts - One for each group
         st.subheader("4. Cumulative Step Line Charts by Group")
-        groups = daily_usage["Group Name"].unique()
+        # Per-group lookups only change with the filtered rows, so keep them per session keyed
+        # on a hash of the rows they are built from (a reload with the same row count differs)
+        deriv_key = int(pd.util.hash_pandas_object(filtered[["Group Name", "Date", "Amount"]], index=False).sum())
+        if st.session_state.get("deriv_key") != deriv_key:
+            st.session_state.deriv = build_derived(filtered, daily_usage)
+            st.session_state.deriv_key = deriv_key
+        deriv = st.session_state.deriv
+        groups = deriv["groups"]
+        budget_by_name = deriv["budget_by_name"]
+        actuals_by_group = deriv["actuals_by_group"]
+        active_days_by_group = deriv["active_days_by_group"]
+        budgets_arr = deriv["budgets_arr"]
+        spent_arr = deriv["spent_arr"]
+        util_arr = deriv["util_arr"]
+        over_budget_mask = deriv["over_budget_mask"]
+        # Transaction amounts as a plain ndarray; filtered is never empty in this branch
+        amounts = filtered["Amount"].to_numpy()
+        amt_max = amounts.max()
+        amt_mean = amounts.mean()
+        amt_std = amounts.std(ddof=1)
         
         for group_name in groups:
             group_data = daily_usage[daily_usage["Group Name"] == group_name].copy()
@@ -212,7 +433,7 @@ def main():
                 height=400,
                 yaxis_tickformat="$,.0f"
             )
-            st.plotly_chart(fig_step, width="stretch")
+            show_chart(fig_step)
         
         # Bar Charts - One for each group  
         st.subheader("5. Daily Bar Charts by Group")
@@ -282,7 +503,7 @@ def main():
                 yaxis_tickformat="$,.0f",
                 barmode="stack"
             )
-            st.plotly_chart(fig_bar, width="stretch")
+            show_chart(fig_bar)
 
         # ===== ADVANCED BUDGET ANALYSIS SECTIONS =====
         
@@ -290,44 +511,42 @@ def main():
         st.subheader("6. Budget Utilization Gauges")
         cols = st.columns(2)
         for i, group_name in enumerate(groups):
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                actual_month_spending = group_data_single["Amount"].sum()
-                monthly_budget = BUDGETS.get(group_key, 1)
-                utilization = (actual_month_spending / monthly_budget * 100) if monthly_budget > 0 else 0
-                
-                # Calculate budget remaining or overspend amount
-                budget_difference = monthly_budget - actual_month_spending
-                
-                # Set delta value and color
-                if budget_difference >= 0:
-                    delta_color = "green"
-                    delta_text = f"${budget_difference:,.0f} remaining"
-                else:
-                    delta_color = "red"  
-                    delta_text = f"${abs(budget_difference):,.0f} over budget"
-                
-                fig_gauge = go.Figure(go.Indicator(
-                    mode = "gauge+number",
-                    value = utilization,
-                    number = {'suffix': "%"},
-                    domain = {'x': [0, 1], 'y': [0, 1]},
-                    title = {'text': f"{group_name}<br>Monthly Budget vs Spent<br>Budget: ${monthly_budget:,.0f} | Spent: ${actual_month_spending:,.0f}<br><span style='color:{delta_color}'>{delta_text}</span>"},
-                    gauge = {
-                        'axis': {'range': [None, 120]},  # Extended to show over-budget
-                        'bar': {'color': "darkblue"},
-                        'steps': [
-                            {'range': [0, 65], 'color': "lightgreen"},
-                            {'range': [65, 80], 'color': "yellow"},
-                            {'range': [80, 100], 'color': "red"},
-                            {'range': [100, 120], 'color': "darkred"}],
-                        'threshold': {
-                            'line': {'color': "blue", 'width': 4},
-                            'thickness': 0.75,
-                            'value': 100}}))
-                fig_gauge.update_layout(height=300)
-                cols[i % 2].plotly_chart(fig_gauge, width="stretch")
+            actual_month_spending = actuals_by_group.get(group_name, 0)
+            monthly_budget = budget_by_name[group_name] or 1
+            utilization = (actual_month_spending / monthly_budget * 100) if monthly_budget > 0 else 0
+            
+            # Calculate budget remaining or overspend amount
+            budget_difference = monthly_budget - actual_month_spending
+            
+            # Set delta value and color
+            if budget_difference >= 0:
+                delta_color = "green"
+                delta_text = f"${budget_difference:,.0f} remaining"
+            else:
+                delta_color = "red"  
+                delta_text = f"${abs(budget_difference):,.0f} over budget"
+            
+            fig_gauge = go.Figure(go.Indicator(
+                mode = "gauge+number",
+                value = utilization,
+                number = {'suffix': "%"},
+                domain = {'x': [0, 1], 'y': [0, 1]},
+                title = {'text': f"{group_name}<br>Monthly Budget vs Spent<br>Budget: ${monthly_budget:,.0f} | Spent: ${actual_month_spending:,.0f}<br><span style='color:{delta_color}'>{delta_text}</span>"},
+                gauge = {
+                    'axis': {'range': [None, 120]},  # Extended to show over-budget
+                    'bar': {'color': "darkblue"},
+                    'steps': [
+                        {'range': [0, 65], 'color': "lightgreen"},
+                        {'range': [65, 80], 'color': "yellow"},
+                        {'range': [80, 100], 'color': "red"},
+                        {'range': [100, 120], 'color': "darkred"}],
+                    'threshold': {
+                        'line': {'color': "blue", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 100}}))
+            fig_gauge.update_layout(height=300)
+            with cols[i % 2]:
+                show_chart(fig_gauge, static=True)
 
         # 7. Waterfall Chart - Budget to Actual
         st.subheader("7. Budget Waterfall Analysis")
@@ -367,14 +586,13 @@ def main():
                 height=400,
                 yaxis_tickformat="$,.0f"
             )
-            st.plotly_chart(fig_waterfall, width="stretch")
+            show_chart(fig_waterfall)
 
         # 8. Heat Map - Daily Spending Intensity
         st.subheader("8. Daily Spending Heat Map")
         if not filtered.empty:
             # Create pivot table for heatmap
-            heatmap_data = filtered.groupby(["Day", "Group Name"])["Amount"].sum().reset_index()
-            heatmap_pivot = heatmap_data.pivot(index="Group Name", columns="Day", values="Amount").fillna(0)
+            heatmap_pivot = filtered.pivot_table(index="Group Name", columns="Day", values="Amount", aggfunc="sum", fill_value=0, observed=True)
             
             fig_heatmap = go.Figure(data=go.Heatmap(
                 z=heatmap_pivot.values,
@@ -390,15 +608,17 @@ def main():
                 yaxis_title="Group",
                 height=300
             )
-            st.plotly_chart(fig_heatmap, width="stretch")
+            show_chart(fig_heatmap)
 
         # 9. Weekly Budget Burn Rate
         st.subheader("9. Weekly Budget Burn Rate")
         if not filtered.empty:
             # Calculate weekly spending
-            filtered_copy = filtered.copy()
-            filtered_copy["Week"] = ((pd.to_datetime(filtered_copy["Date"]).dt.day - 1) // 7) + 1
-            weekly_spending = filtered_copy.groupby(["Week", "Group Name"])["Amount"].sum().reset_index()
+            # Day is parsed once in filter_month
+            weekly_spending = (
+                filtered.assign(Week=(filtered["Day"] - 1) // 7 + 1)
+                .groupby(["Week", "Group Name"], observed=True)["Amount"].sum().reset_index()
+            )
             
             fig_weekly = px.bar(
                 weekly_spending,
@@ -412,15 +632,14 @@ def main():
                 yaxis_tickformat="$,.0f",
                 height=400
             )
-            st.plotly_chart(fig_weekly, width="stretch")
+            show_chart(fig_weekly)
 
         # 10. Running Variance Analysis  
         st.subheader("10. Cumulative Budget Variance")
         for group_name in groups:
             group_data_single = daily_usage[daily_usage["Group Name"] == group_name].copy()
             if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
+                budget = budget_by_name[group_name]
                 daily_budget = budget / 30
                 
                 group_data_single = group_data_single.sort_values("Day")
@@ -445,32 +664,29 @@ def main():
                     height=400,
                     yaxis_tickformat="$,.0f"
                 )
-                st.plotly_chart(fig_variance, width="stretch")
+                show_chart(fig_variance)
 
         # 11. Budget Progress Bars
         st.subheader("11. Budget Utilization Progress")
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                actual = group_data_single["Amount"].sum()
-                budget = BUDGETS.get(group_key, 1)
-                percentage = min((actual / budget * 100), 150) if budget > 0 else 0
-                
-                # Color coding
-                if percentage <= 80:
-                    color = "normal"
-                elif percentage <= 100:
-                    color = "warning" 
-                else:
-                    color = "danger"
-                
-                st.metric(
-                    label=f"{group_name} Budget Usage", 
-                    value=f"{percentage:.1f}%",
-                    delta=f"${actual - budget:,.0f} vs budget"
-                )
-                st.progress(min(percentage/100, 1.0))
+            actual = actuals_by_group.get(group_name, 0)
+            budget = budget_by_name[group_name] or 1
+            percentage = min((actual / budget * 100), 150) if budget > 0 else 0
+            
+            # Color coding
+            if percentage <= 80:
+                color = "normal"
+            elif percentage <= 100:
+                color = "warning" 
+            else:
+                color = "danger"
+            
+            st.metric(
+                label=f"{group_name} Budget Usage", 
+                value=f"{percentage:.1f}%",
+                delta=f"${actual - budget:,.0f} vs budget"
+            )
+            st.progress(min(percentage/100, 1.0))
 
         # 12. Forecast Projection
         st.subheader("12. Month-End Spending Forecast")
@@ -478,23 +694,20 @@ def main():
         forecast_data = []
         
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
-                actual_to_date = group_data_single["Amount"].sum()
-                daily_avg = actual_to_date / len(group_data_single)
-                days_remaining = 31 - today_day
-                projected_total = actual_to_date + (daily_avg * days_remaining)
-                
-                forecast_data.append({
-                    "Group": group_name,
-                    "Actual to Date": f"${actual_to_date:,.0f}",
-                    "Projected Total": f"${projected_total:,.0f}",
-                    "Budget": f"${budget:,.0f}",
-                    "Projected Variance": f"${projected_total - budget:,.0f}",
-                    "Risk Level": "🔴 High" if projected_total > budget * 1.1 else "🟡 Medium" if projected_total > budget else "🟢 Low"
-                })
+            budget = budget_by_name[group_name]
+            actual_to_date = actuals_by_group.get(group_name, 0)
+            daily_avg = actual_to_date / active_days_by_group[group_name]
+            days_remaining = 31 - today_day
+            projected_total = actual_to_date + (daily_avg * days_remaining)
+            
+            forecast_data.append({
+                "Group": group_name,
+                "Actual to Date": f"${actual_to_date:,.0f}",
+                "Projected Total": f"${projected_total:,.0f}",
+                "Budget": f"${budget:,.0f}",
+                "Projected Variance": f"${projected_total - budget:,.0f}",
+                "Risk Level": "🔴 High" if projected_total > budget * 1.1 else "🟡 Medium" if projected_total > budget else "🟢 Low"
+            })
         
         if forecast_data:
             forecast_df = pd.DataFrame(forecast_data)
@@ -528,21 +741,18 @@ def main():
         
         alerts = []
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                actual = group_data_single["Amount"].sum()
-                budget = BUDGETS.get(group_key, 1)
-                utilization = (actual / budget * 100) if budget > 0 else 0
-                
-                if utilization >= alert_threshold:
-                    alert_level = "🚨 Critical" if utilization > 100 else "⚠️ Warning"
-                    alerts.append({
-                        "Group": group_name,
-                        "Utilization": f"{utilization:.1f}%",
-                        "Amount Over Threshold": f"${actual - (budget * alert_threshold/100):,.0f}",
-                        "Alert Level": alert_level
-                    })
+            actual = actuals_by_group.get(group_name, 0)
+            budget = budget_by_name[group_name] or 1
+            utilization = (actual / budget * 100) if budget > 0 else 0
+            
+            if utilization >= alert_threshold:
+                alert_level = "🚨 Critical" if utilization > 100 else "⚠️ Warning"
+                alerts.append({
+                    "Group": group_name,
+                    "Utilization": f"{utilization:.1f}%",
+                    "Amount Over Threshold": f"${actual - (budget * alert_threshold/100):,.0f}",
+                    "Alert Level": alert_level
+                })
         
         if alerts:
             alert_df = pd.DataFrame(alerts)
@@ -555,8 +765,8 @@ def main():
         
         # Get min and max part values for slider range
         if not filtered.empty:
-            min_amount = int(filtered["Amount"].min())
-            max_amount = int(filtered["Amount"].max())
+            min_amount = int(amounts.min())
+            max_amount = int(amt_max)
             
             # Slider for parts threshold
             parts_threshold = st.slider(
@@ -568,7 +778,7 @@ def main():
             )
             
             # Filter parts above threshold
-            high_value_parts = filtered[filtered["Amount"] >= parts_threshold].copy()
+            high_value_parts = filtered[amounts >= parts_threshold].copy()
             
             if not high_value_parts.empty:
                 # Sort by amount descending
@@ -606,7 +816,7 @@ def main():
                 
                 # Show distribution by group
                 st.subheader("High Value Parts by Group")
-                group_dist = high_value_parts.groupby("Group Name").agg({
+                group_dist = high_value_parts.groupby("Group Name", observed=True).agg({
                     "Amount": ["count", "sum", "mean"]
                 }).round(0)
                 group_dist.columns = ["Count", "Total ($)", "Average ($)"]
@@ -617,7 +827,7 @@ def main():
                 group_dist["Average ($)"] = group_dist["Average ($)"].apply(lambda x: f"${x:,.0f}")
                 
                 st.dataframe(group_dist, width="stretch")
-                
+            
             else:
                 st.info(f"💡 No parts found above ${parts_threshold:,} threshold.")
                 st.balloons()  # Celebrate when no high-value parts!
@@ -631,27 +841,24 @@ def main():
         if not filtered.empty:
             velocity_data = []
             for group_name in groups:
-                group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-                if not group_data_single.empty:
-                    group_key = group_data_single["Group Key"].iloc[0]
-                    budget = BUDGETS.get(group_key, 0)
-                    actual = group_data_single["Amount"].sum()
-                    days_elapsed = 12  # Current day of month
-                    days_in_month = 31
-                    
-                    actual_velocity = actual / days_elapsed if days_elapsed > 0 else 0
-                    expected_velocity = budget / days_in_month
-                    velocity_ratio = (actual_velocity / expected_velocity * 100) if expected_velocity > 0 else 0
-                    
-                    status = "🟢 Optimal" if 80 <= velocity_ratio <= 120 else "🟡 Caution" if 60 <= velocity_ratio <= 140 else "🔴 Critical"
-                    
-                    velocity_data.append({
-                        "Group": group_name,
-                        "Daily Velocity": f"${actual_velocity:,.0f}/day",
-                        "Expected Velocity": f"${expected_velocity:,.0f}/day",
-                        "Velocity Ratio": f"{velocity_ratio:.1f}%",
-                        "Status": status
-                    })
+                budget = budget_by_name[group_name]
+                actual = actuals_by_group.get(group_name, 0)
+                days_elapsed = 12  # Current day of month
+                days_in_month = 31
+                
+                actual_velocity = actual / days_elapsed if days_elapsed > 0 else 0
+                expected_velocity = budget / days_in_month
+                velocity_ratio = (actual_velocity / expected_velocity * 100) if expected_velocity > 0 else 0
+                
+                status = "🟢 Optimal" if 80 <= velocity_ratio <= 120 else "🟡 Caution" if 60 <= velocity_ratio <= 140 else "🔴 Critical"
+                
+                velocity_data.append({
+                    "Group": group_name,
+                    "Daily Velocity": f"${actual_velocity:,.0f}/day",
+                    "Expected Velocity": f"${expected_velocity:,.0f}/day",
+                    "Velocity Ratio": f"{velocity_ratio:.1f}%",
+                    "Status": status
+                })
             
             if velocity_data:
                 velocity_df = pd.DataFrame(velocity_data)
@@ -668,25 +875,22 @@ def main():
         
         seasonal_analysis = []
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0].lower()
-                actual = group_data_single["Amount"].sum()
-                
-                # Simulate historical data
-                historical_avg = seasonal_data.get(group_name.replace(" ", ""), {}).get("Dec", 50000)
-                seasonal_factor = seasonal_data.get(group_name.replace(" ", ""), {}).get("Seasonal_Factor", 1.0)
-                
-                projected_monthly = (actual / 12) * 31  # Project full month
-                vs_historical = ((projected_monthly / historical_avg - 1) * 100) if historical_avg > 0 else 0
-                
-                seasonal_analysis.append({
-                    "Group": group_name,
-                    "Projected Monthly": f"${projected_monthly:,.0f}",
-                    "Historical Avg": f"${historical_avg:,.0f}",
-                    "vs Historical": f"{vs_historical:+.1f}%",
-                    "Seasonal Factor": f"{seasonal_factor:.2f}x"
-                })
+            actual = actuals_by_group.get(group_name, 0)
+            
+            # Simulate historical data
+            historical_avg = seasonal_data.get(group_name.replace(" ", ""), {}).get("Dec", 50000)
+            seasonal_factor = seasonal_data.get(group_name.replace(" ", ""), {}).get("Seasonal_Factor", 1.0)
+            
+            projected_monthly = (actual / 12) * 31  # Project full month
+            vs_historical = ((projected_monthly / historical_avg - 1) * 100) if historical_avg > 0 else 0
+            
+            seasonal_analysis.append({
+                "Group": group_name,
+                "Projected Monthly": f"${projected_monthly:,.0f}",
+                "Historical Avg": f"${historical_avg:,.0f}",
+                "vs Historical": f"{vs_historical:+.1f}%",
+                "Seasonal Factor": f"{seasonal_factor:.2f}x"
+            })
         
         if seasonal_analysis:
             seasonal_df = pd.DataFrame(seasonal_analysis)
@@ -694,62 +898,49 @@ def main():
 
         # 18. Budget Efficiency Scoring
         st.subheader("18. Budget Efficiency Scoring")
-        efficiency_scores = []
-        for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
-                actual = group_data_single["Amount"].sum()
-                
-                # Efficiency metrics (0-100 scale)
-                utilization_score = min(100, (actual / budget * 100)) if budget > 0 else 0
-                consistency_score = max(0, 100 - (group_data_single["Amount"].std() / group_data_single["Amount"].mean() * 100)) if len(group_data_single) > 1 else 100
-                timing_score = 85  # Simulated based on spending distribution
-                
-                composite_score = (utilization_score * 0.4 + consistency_score * 0.3 + timing_score * 0.3)
-                
-                grade = "A" if composite_score >= 90 else "B" if composite_score >= 80 else "C" if composite_score >= 70 else "D"
-                
-                efficiency_scores.append({
-                    "Group": group_name,
-                    "Utilization": f"{utilization_score:.1f}",
-                    "Consistency": f"{consistency_score:.1f}",
-                    "Timing": f"{timing_score:.1f}",
-                    "Composite Score": f"{composite_score:.1f}",
-                    "Grade": grade
-                })
-        
-        if efficiency_scores:
-            efficiency_df = pd.DataFrame(efficiency_scores)
-            st.dataframe(efficiency_df, width="stretch")
+        # Score all groups in one vectorised pass over the per-group daily stats
+        daily_stats = daily_usage.groupby("Group Name", observed=True)["Amount"].agg(["mean", "std", "count"]).reindex(groups)
+        utilization_score, consistency_score, timing_score, composite_score, grade = score_groups(
+            spent_arr,
+            budgets_arr,
+            daily_stats["mean"].to_numpy(),
+            daily_stats["std"].to_numpy(),
+            daily_stats["count"].to_numpy(),
+        )
+
+        efficiency_df = pd.DataFrame({
+            "Group": groups,
+            "Utilization": [f"{v:.1f}" for v in utilization_score],
+            "Consistency": [f"{v:.1f}" for v in consistency_score],
+            "Timing": [f"{v:.1f}" for v in timing_score],
+            "Composite Score": [f"{v:.1f}" for v in composite_score],
+            "Grade": grade,
+        })
+        st.dataframe(efficiency_df, width="stretch")
 
         # 19. Variance Trend Prediction
         st.subheader("19. Variance Trend Prediction")
         prediction_data = []
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
-                actual = group_data_single["Amount"].sum()
-                
-                # Simple trend prediction
-                current_variance = actual - (budget * 12/31)
-                daily_avg = actual / 12
-                projected_month_end = daily_avg * 31
-                predicted_variance = projected_month_end - budget
-                
-                trend = "📈 Increasing" if predicted_variance > current_variance else "📉 Decreasing"
-                risk_level = "🔴 High" if abs(predicted_variance) > budget * 0.2 else "🟡 Medium" if abs(predicted_variance) > budget * 0.1 else "🟢 Low"
-                
-                prediction_data.append({
-                    "Group": group_name,
-                    "Current Variance": f"${current_variance:,.0f}",
-                    "Predicted Variance": f"${predicted_variance:,.0f}",
-                    "Trend": trend,
-                    "Risk Level": risk_level
-                })
+            budget = budget_by_name[group_name]
+            actual = actuals_by_group.get(group_name, 0)
+            
+            # Simple trend prediction
+            current_variance = actual - (budget * 12/31)
+            daily_avg = actual / 12
+            projected_month_end = daily_avg * 31
+            predicted_variance = projected_month_end - budget
+            
+            trend = "📈 Increasing" if predicted_variance > current_variance else "📉 Decreasing"
+            risk_level = "🔴 High" if abs(predicted_variance) > budget * 0.2 else "🟡 Medium" if abs(predicted_variance) > budget * 0.1 else "🟢 Low"
+            
+            prediction_data.append({
+                "Group": group_name,
+                "Current Variance": f"${current_variance:,.0f}",
+                "Predicted Variance": f"${predicted_variance:,.0f}",
+                "Trend": trend,
+                "Risk Level": risk_level
+            })
         
         if prediction_data:
             prediction_df = pd.DataFrame(prediction_data)
@@ -772,8 +963,7 @@ def main():
         if st.button("Simulate Reallocation"):
             reallocation_results = []
             for group_name in groups:
-                group_key = group_name.lower().replace(" ", "")
-                original_budget = BUDGETS.get(group_key, 0)
+                original_budget = budget_by_name[group_name]
                 
                 if group_name == source_group:
                     new_budget = original_budget - amount_to_move
@@ -782,7 +972,7 @@ def main():
                 else:
                     new_budget = original_budget
                 
-                actual = daily_usage[daily_usage["Group Name"] == group_name]["Amount"].sum() if not daily_usage.empty else 0
+                actual = actuals_by_group.get(group_name, 0)
                 new_utilization = (actual / new_budget * 100) if new_budget > 0 else 0
                 
                 reallocation_results.append({
@@ -799,67 +989,52 @@ def main():
         # 21. Approval Workflow Dashboard (Simulated)
         st.subheader("21. Approval Workflow Dashboard")
         
-        # Simulate approval data
-        import random
-        approval_data = []
-        for i in range(10):
-            group = random.choice(list(groups))
-            amount = random.randint(1000, 8000)
-            status = random.choice(["⏳ Pending", "✅ Approved", "❌ Rejected", "🔄 Review"])
-            days_pending = random.randint(1, 14)
-            
-            approval_data.append({
-                "Request ID": f"REQ-{1000 + i}",
-                "Group": group,
-                "Amount": f"${amount:,}",
-                "Status": status,
-                "Days Pending": str(days_pending) if "Pending" in status else "-",
-                "Urgency": "🔴 High" if days_pending > 7 else "🟡 Medium" if days_pending > 3 else "🟢 Low"
-            })
-        
-        approval_df = pd.DataFrame(approval_data)
+        # Simulate approval data, one batched draw per column
+        n_requests = 10
+        approval_amounts = RNG.integers(1000, 8000, size=n_requests, endpoint=True)
+        approval_status = RNG.choice(["⏳ Pending", "✅ Approved", "❌ Rejected", "🔄 Review"], size=n_requests)
+        days_pending = RNG.integers(1, 14, size=n_requests, endpoint=True)
+
+        approval_df = pd.DataFrame({
+            "Request ID": [f"REQ-{1000 + i}" for i in range(n_requests)],
+            "Group": RNG.choice(list(groups), size=n_requests),
+            "Amount": [f"${amount:,}" for amount in approval_amounts],
+            "Status": approval_status,
+            "Days Pending": np.where(approval_status == "⏳ Pending", days_pending.astype(str), "-"),
+            "Urgency": np.select([days_pending > 7, days_pending > 3], ["🔴 High", "🟡 Medium"], default="🟢 Low"),
+        })
         st.dataframe(approval_df, width="stretch")
 
         # 22. Budget Amendment History (Simulated)
         st.subheader("22. Budget Amendment History")
-        amendment_history = [
-            {"Date": "2025-11-15", "Group": "Parts", "Change": "+$15,000", "Reason": "Equipment upgrade", "Approved By": "CFO"},
-            {"Date": "2025-11-08", "Group": "GroupC", "Change": "-$5,000", "Reason": "Project delay", "Approved By": "Director"},
-            {"Date": "2025-10-22", "Group": "GroupA", "Change": "+$8,000", "Reason": "Additional resources", "Approved By": "Manager"},
-        ]
-        
-        amendment_df = pd.DataFrame(amendment_history)
-        st.dataframe(amendment_df, width="stretch")
+        st.dataframe(static_tables["amendments"], width="stretch")
 
         # 23. Spending Velocity Alerts
         st.subheader("23. Spending Velocity Alerts")
         velocity_alerts = []
         
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
-                actual = group_data_single["Amount"].sum()
-                
-                daily_avg = actual / 12
-                monthly_projection = daily_avg * 31
-                velocity_vs_budget = (monthly_projection / budget * 100) if budget > 0 else 0
-                
-                if velocity_vs_budget > 120:
-                    alert_type = "🚨 Overspending"
-                elif velocity_vs_budget < 60:
-                    alert_type = "⚠️ Underspending"
-                else:
-                    continue
-                
-                velocity_alerts.append({
-                    "Group": group_name,
-                    "Alert Type": alert_type,
-                    "Projected Monthly": f"${monthly_projection:,.0f}",
-                    "vs Budget": f"{velocity_vs_budget:.1f}%",
-                    "Action Needed": "Review spending plan" if "Over" in alert_type else "Accelerate spending"
-                })
+            budget = budget_by_name[group_name]
+            actual = actuals_by_group.get(group_name, 0)
+            
+            daily_avg = actual / 12
+            monthly_projection = daily_avg * 31
+            velocity_vs_budget = (monthly_projection / budget * 100) if budget > 0 else 0
+            
+            if velocity_vs_budget > 120:
+                alert_type = "🚨 Overspending"
+            elif velocity_vs_budget < 60:
+                alert_type = "⚠️ Underspending"
+            else:
+                continue
+            
+            velocity_alerts.append({
+                "Group": group_name,
+                "Alert Type": alert_type,
+                "Projected Monthly": f"${monthly_projection:,.0f}",
+                "vs Budget": f"{velocity_vs_budget:.1f}%",
+                "Action Needed": "Review spending plan" if "Over" in alert_type else "Accelerate spending"
+            })
         
         if velocity_alerts:
             velocity_alert_df = pd.DataFrame(velocity_alerts)
@@ -872,75 +1047,50 @@ def main():
         # 24. Executive Summary Cards
         st.subheader("24. Executive Summary Cards")
         
-        # Calculate key metrics
+        # Calculate key metrics up front, then render them in one column layout
         total_budget = sum(BUDGETS.values())
-        total_actual = filtered["Amount"].sum() if not filtered.empty else 0
+        total_actual = amounts.sum()
         overall_utilization = (total_actual / total_budget * 100) if total_budget > 0 else 0
-        
-        # Executive metrics in columns
-        exec_col1, exec_col2, exec_col3, exec_col4 = st.columns(4)
-        
-        with exec_col1:
-            st.metric(
-                "Overall Budget Utilization", 
-                f"{overall_utilization:.1f}%",
-                delta=f"{overall_utilization - 100:.1f}% vs target"
-            )
-        
-        with exec_col2:
-            groups_over_budget = sum(1 for row in comparison_data if float(row["Variance"].replace("$", "").replace(",", "")) > 0)
-            st.metric(
-                "Groups Over Budget", 
-                f"{groups_over_budget}/{len(groups)}",
-                delta="Requires attention" if groups_over_budget > 0 else "All on track"
-            )
-        
-        with exec_col3:
-            high_value_parts_count = len(filtered[filtered["Amount"] >= filtered["Amount"].quantile(0.9)]) if not filtered.empty else 0
-            st.metric(
-                "High Value Transactions", 
-                high_value_parts_count,
-                delta="Top 10% by value"
-            )
-        
-        with exec_col4:
-            projected_year_end = total_actual * 12  # Simple projection
-            st.metric(
-                "Projected Year-End", 
-                f"${projected_year_end:,.0f}",
-                delta=f"${projected_year_end - (total_budget * 12):+,.0f} vs annual"
-            )
+        groups_over_budget = int(np.count_nonzero(over_budget_mask))
+        high_value_parts_count = int(np.count_nonzero(amounts >= np.quantile(amounts, 0.9)))
+        projected_year_end = total_actual * 12  # Simple projection
+        
+        exec_metrics = {
+            "Overall Budget Utilization": (f"{overall_utilization:.1f}%", f"{overall_utilization - 100:.1f}% vs target"),
+            "Groups Over Budget": (f"{groups_over_budget}/{len(groups)}", "Requires attention" if groups_over_budget > 0 else "All on track"),
+            "High Value Transactions": (high_value_parts_count, "Top 10% by value"),
+            "Projected Year-End": (f"${projected_year_end:,.0f}", f"${projected_year_end - (total_budget * 12):+,.0f} vs annual"),
+        }
+        for col, (label, (value, delta)) in zip(st.columns(len(exec_metrics)), exec_metrics.items()):
+            col.metric(label, value, delta=delta)
 
         # 25. Budget Performance Matrix
         st.subheader("25. Budget Performance Matrix")
         
         matrix_data = []
         for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                group_key = group_data_single["Group Key"].iloc[0]
-                budget = BUDGETS.get(group_key, 0)
-                actual = group_data_single["Amount"].sum()
-                
-                utilization = (actual / budget * 100) if budget > 0 else 0
-                efficiency = 90 - abs(utilization - 85)  # Simulated efficiency score
-                
-                # Quadrant classification
-                if utilization >= 90 and efficiency >= 85:
-                    quadrant = "🟢 High Perform"
-                elif utilization >= 90:
-                    quadrant = "🟡 High Use/Low Eff"
-                elif efficiency >= 85:
-                    quadrant = "🔵 Low Use/High Eff"
-                else:
-                    quadrant = "🔴 Needs Attention"
-                
-                matrix_data.append({
-                    "Group": group_name,
-                    "Utilization %": f"{utilization:.1f}",
-                    "Efficiency Score": f"{efficiency:.1f}",
-                    "Performance Quadrant": quadrant
-                })
+            budget = budget_by_name[group_name]
+            actual = actuals_by_group.get(group_name, 0)
+            
+            utilization = (actual / budget * 100) if budget > 0 else 0
+            efficiency = 90 - abs(utilization - 85)  # Simulated efficiency score
+            
+            # Quadrant classification
+            if utilization >= 90 and efficiency >= 85:
+                quadrant = "🟢 High Perform"
+            elif utilization >= 90:
+                quadrant = "🟡 High Use/Low Eff"
+            elif efficiency >= 85:
+                quadrant = "🔵 Low Use/High Eff"
+            else:
+                quadrant = "🔴 Needs Attention"
+            
+            matrix_data.append({
+                "Group": group_name,
+                "Utilization %": f"{utilization:.1f}",
+                "Efficiency Score": f"{efficiency:.1f}",
+                "Performance Quadrant": quadrant
+            })
         
         if matrix_data:
             matrix_df = pd.DataFrame(matrix_data)
@@ -948,41 +1098,32 @@ def main():
 
         # 26. ROI Impact Analysis (Simulated)
         st.subheader("26. ROI Impact Analysis")
-        
-        roi_data = [
-            {"Group": "GroupA", "Investment": "$45,000", "Revenue Impact": "$180,000", "ROI": "300%", "Payback": "3 months"},
-            {"Group": "GroupB", "Investment": "$38,000", "Revenue Impact": "$152,000", "ROI": "280%", "Payback": "3.2 months"},
-            {"Group": "GroupC", "Investment": "$52,000", "Revenue Impact": "$156,000", "ROI": "200%", "Payback": "4 months"},
-            {"Group": "Parts", "Investment": "$285,000", "Revenue Impact": "$855,000", "ROI": "200%", "Payback": "4 months"},
-        ]
-        
-        roi_df = pd.DataFrame(roi_data)
-        st.dataframe(roi_df, width="stretch")
+        st.dataframe(static_tables["roi"], width="stretch")
 
         # 27. Comparative Benchmark
         st.subheader("27. Comparative Benchmark")
         
         benchmark_data = []
-        for group_name in groups:
-            group_data_single = daily_usage[daily_usage["Group Name"] == group_name]
-            if not group_data_single.empty:
-                actual = group_data_single["Amount"].sum()
-                
-                # Simulated industry benchmarks
-                industry_avg = actual * random.uniform(0.8, 1.3)
-                peer_avg = actual * random.uniform(0.9, 1.2)
-                
-                vs_industry = ((actual / industry_avg - 1) * 100) if industry_avg > 0 else 0
-                vs_peer = ((actual / peer_avg - 1) * 100) if peer_avg > 0 else 0
-                
-                benchmark_data.append({
-                    "Group": group_name,
-                    "Our Spending": f"${actual:,.0f}",
-                    "Industry Avg": f"${industry_avg:,.0f}",
-                    "Peer Avg": f"${peer_avg:,.0f}",
-                    "vs Industry": f"{vs_industry:+.1f}%",
-                    "vs Peers": f"{vs_peer:+.1f}%"
-                })
+        # Simulated industry/peer multipliers, drawn for all groups at once
+        industry_factors = RNG.uniform(0.8, 1.3, size=len(groups))
+        peer_factors = RNG.uniform(0.9, 1.2, size=len(groups))
+        for i, group_name in enumerate(groups):
+            actual = actuals_by_group.get(group_name, 0)
+            
+            industry_avg = actual * industry_factors[i]
+            peer_avg = actual * peer_factors[i]
+            
+            vs_industry = ((actual / industry_avg - 1) * 100) if industry_avg > 0 else 0
+            vs_peer = ((actual / peer_avg - 1) * 100) if peer_avg > 0 else 0
+            
+            benchmark_data.append({
+                "Group": group_name,
+                "Our Spending": f"${actual:,.0f}",
+                "Industry Avg": f"${industry_avg:,.0f}",
+                "Peer Avg": f"${peer_avg:,.0f}",
+                "vs Industry": f"{vs_industry:+.1f}%",
+                "vs Peers": f"{vs_peer:+.1f}%"
+            })
         
         if benchmark_data:
             benchmark_df = pd.DataFrame(benchmark_data)
@@ -997,12 +1138,12 @@ def main():
         
         anomalies = []
         if not filtered.empty:
-            mean_amount = filtered["Amount"].mean()
-            std_amount = filtered["Amount"].std()
+            mean_amount = amt_mean
+            std_amount = amt_std
             
             anomaly_transactions = filtered[
-                (filtered["Amount"] > mean_amount + anomaly_threshold * std_amount) |
-                (filtered["Amount"] < mean_amount - anomaly_threshold * std_amount)
+                (amounts > mean_amount + anomaly_threshold * std_amount) |
+                (amounts < mean_amount - anomaly_threshold * std_amount)
             ]
             
             for _, row in anomaly_transactions.iterrows():
@@ -1027,53 +1168,27 @@ def main():
         st.subheader("29. Vendor/Supplier Analysis")
         
         vendors = ["Supplier A", "Supplier B", "Supplier C", "Supplier D", "Supplier E"]
-        vendor_data = []
-        
-        for vendor in vendors:
-            spend = random.randint(25000, 150000)
-            transactions = random.randint(5, 25)
-            avg_order = spend / transactions
-            rating = random.uniform(3.5, 5.0)
-            
-            vendor_data.append({
-                "Vendor": vendor,
-                "Total Spend": f"${spend:,.0f}",
-                "Transactions": transactions,
-                "Avg Order Value": f"${avg_order:,.0f}",
-                "Performance Rating": f"{rating:.1f}/5.0",
-                "Status": "🟢 Preferred" if rating >= 4.5 else "🟡 Standard" if rating >= 4.0 else "🔴 Review"
-            })
-        
-        vendor_df = pd.DataFrame(vendor_data)
+        vendor_spend = RNG.integers(25000, 150000, size=len(vendors), endpoint=True)
+        vendor_transactions = RNG.integers(5, 25, size=len(vendors), endpoint=True)
+        vendor_rating = RNG.uniform(3.5, 5.0, size=len(vendors))
+
+        vendor_df = pd.DataFrame({
+            "Vendor": vendors,
+            "Total Spend": [f"${spend:,.0f}" for spend in vendor_spend],
+            "Transactions": vendor_transactions,
+            "Avg Order Value": [f"${avg_order:,.0f}" for avg_order in vendor_spend / vendor_transactions],
+            "Performance Rating": [f"{rating:.1f}/5.0" for rating in vendor_rating],
+            "Status": np.select([vendor_rating >= 4.5, vendor_rating >= 4.0], ["🟢 Preferred", "🟡 Standard"], default="🔴 Review"),
+        })
         st.dataframe(vendor_df, width="stretch")
 
         # 30. Seasonal Budget Calendar
         st.subheader("30. Seasonal Budget Calendar")
-        
-        # Create a simple calendar view
-        calendar_data = {
-            "Week 1": {"Planned": 25, "Actual": 30, "Status": "🟡"},
-            "Week 2": {"Planned": 25, "Actual": 28, "Status": "🟡"},
-            "Week 3": {"Planned": 25, "Actual": 22, "Status": "🟢"},
-            "Week 4": {"Planned": 25, "Actual": 20, "Status": "🟢"}
-        }
-        
-        cal_df = pd.DataFrame(calendar_data).T.reset_index()
-        cal_df.columns = ["Period", "Planned %", "Actual %", "Status"]
-        st.dataframe(cal_df, width="stretch")
+        st.dataframe(static_tables["calendar"], width="stretch")
 
         # 31. Resource Constraint Tracker
         st.subheader("31. Resource Constraint Tracker")
-        
-        constraints = [
-            {"Resource": "Budget Capacity", "Utilization": "78%", "Constraint Level": "🟢 Low", "Impact": "Minimal"},
-            {"Resource": "Approval Bandwidth", "Utilization": "92%", "Constraint Level": "🟡 Medium", "Impact": "Delays possible"},
-            {"Resource": "Vendor Capacity", "Utilization": "85%", "Constraint Level": "🟡 Medium", "Impact": "Lead time increase"},
-            {"Resource": "Internal Resources", "Utilization": "95%", "Constraint Level": "🔴 High", "Impact": "Process bottleneck"}
-        ]
-        
-        constraint_df = pd.DataFrame(constraints)
-        st.dataframe(constraint_df, width="stretch")
+        st.dataframe(static_tables["constraints"], width="stretch")
 
         # ===== INTERACTIVE FEATURES SECTIONS =====
         
@@ -1083,13 +1198,14 @@ def main():
         mobile_summary = {
             "🎯 Budget Status": f"{overall_utilization:.0f}% utilized",
             "⚠️ Alerts": f"{groups_over_budget} groups over budget",
-            "💰 Top Spend": f"${filtered['Amount'].max():,.0f}" if not filtered.empty else "$0",
+            "💰 Top Spend": f"${amt_max:,.0f}",
             "📈 Trend": "↗️ Increasing" if overall_utilization > 85 else "➡️ Stable",
             "🎛️ Control": "✅ On Track" if groups_over_budget == 0 else "❌ Needs Action"
         }
-        
-        for key, value in mobile_summary.items():
-            st.metric(key, value)
+
+        # Single table render instead of one metric widget per entry
+        mobile_df = pd.DataFrame(list(mobile_summary.items()), columns=["Metric", "Value"])
+        st.dataframe(mobile_df, hide_index=True, width="stretch")
 
         # 33. Export Options
         st.subheader("33. Export to Excel")
@@ -1120,7 +1236,7 @@ def main():
         with filter_col1:
             custom_group = st.multiselect("Select Groups:", options=list(groups), default=list(groups))
         with filter_col2:
-            amount_range = st.slider("Amount Range ($)", 0, int(filtered["Amount"].max()) if not filtered.empty else 10000, (0, 5000))
+            amount_range = st.slider("Amount Range ($)", 0, int(amt_max), (0, 5000))
         
         date_range = st.date_input("Date Range:", value=[pd.to_datetime("2025-12-01").date(), pd.to_datetime("2025-12-12").date()])
         
@@ -1143,10 +1259,8 @@ def main():
         # 36. Weekly Heatmap by Group
         st.subheader("36. Weekly Heatmap by Group")
         if not filtered.empty:
-            wk_data = filtered.copy()
-            wk_data["Week"] = ((pd.to_datetime(wk_data["Date"]).dt.day - 1) // 7) + 1
-            heat_data = wk_data.groupby(["Week", "Group Name"])["Amount"].sum().reset_index()
-            pivot_heat = heat_data.pivot(index="Group Name", columns="Week", values="Amount").fillna(0)
+            wk_data = filtered.assign(Week=(filtered["Day"] - 1) // 7 + 1)
+            pivot_heat = wk_data.pivot_table(index="Group Name", columns="Week", values="Amount", aggfunc="sum", fill_value=0, observed=True)
             
             fig_heat = go.Figure(data=go.Heatmap(
                 z=pivot_heat.values,
@@ -1161,13 +1275,13 @@ def main():
                 yaxis_title="Group", 
                 height=300
             )
-            st.plotly_chart(fig_heat, use_container_width=True)
+            show_chart(fig_heat)
 
         # 37. Top-N Parts by Value
         st.subheader("37. Top-N Parts by Value")
         if not filtered.empty:
             top_n = st.slider("Select Top N parts", 5, 30, 10, key="top_parts_slider")
-            parts_summary = filtered.groupby(["Part Name", "Group Name"])['Amount'].sum().reset_index()
+            parts_summary = filtered.groupby(["Part Name", "Group Name"], observed=True)['Amount'].sum().reset_index()
             top_parts = parts_summary.sort_values('Amount', ascending=False).head(top_n)
             
             fig_parts = px.bar(
@@ -1179,15 +1293,14 @@ def main():
                 title=f'Top {top_n} Parts by Value This Month'
             )
             fig_parts.update_layout(xaxis_tickformat='$,.0f', height=400, yaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig_parts, use_container_width=True)
+            show_chart(fig_parts)
 
         # 38. Bullet Chart per Group
         st.subheader("38. Bullet Chart per Group (Actual vs Budget)")
         if not filtered.empty:
             for group_name in groups:
-                group_key = group_name.strip().lower()
-                budget = BUDGETS.get(group_key, 0)
-                actual = filtered[filtered['Group Name'] == group_name]['Amount'].sum()
+                budget = budget_by_name[group_name]
+                actual = actuals_by_group.get(group_name, 0)
                 
                 fig_bullet = go.Figure()
                 # Background budget bar (lighter)
@@ -1217,28 +1330,34 @@ def main():
                     height=120,
                     margin=dict(l=50, r=50, t=50, b=30)
                 )
-                st.plotly_chart(fig_bullet, use_container_width=True)
+                show_chart(fig_bullet, static=True)
 
         # 39. Daily Rolling Average (7-day)
         st.subheader("39. Daily 7-day Rolling Average by Group")
-        if not daily_usage.empty:
+        if daily_usage.empty or daily_usage['Day'].nunique() < 2:
+            st.info("Insufficient data for a rolling average.")
+        else:
             last_day = int(daily_usage['Day'].max())
             days_range = list(range(1, last_day + 1))
-            
-            fig_rolling = go.Figure()
-            for group_name in groups:
-                group_daily = daily_usage[daily_usage['Group Name'] == group_name][['Day','Amount']].set_index('Day')
-                daily_indexed = group_daily.reindex(days_range, fill_value=0)
-                rolling_avg = daily_indexed['Amount'].rolling(window=7, min_periods=1).mean()
-                
-                fig_rolling.add_trace(go.Scatter(
-                    x=days_range, 
-                    y=rolling_avg, 
-                    mode='lines+markers', 
+
+            # Day x group matrix, gap-filled with zeros, rolled for all groups at once
+            daily_matrix = (
+                daily_usage.pivot_table(index='Day', columns='Group Name', values='Amount', aggfunc='sum', fill_value=0, observed=True)
+                .reindex(index=days_range, columns=groups, fill_value=0)
+            )
+            rolling_avg = daily_matrix.rolling(window=7, min_periods=1).mean().to_numpy()
+
+            fig_rolling = go.Figure(data=[
+                go.Scatter(
+                    x=days_range,
+                    y=rolling_avg[:, i],
+                    mode='lines+markers',
                     name=group_name,
                     hovertemplate='Day %{x}<br>7-day Average: $%{y:,.0f}<extra></extra>'
-                ))
-            
+                )
+                for i, group_name in enumerate(groups)
+            ])
+
             fig_rolling.update_layout(
                 title='7-day Rolling Average Spending by Group', 
                 xaxis_title='Day of Month', 
@@ -1246,7 +1365,7 @@ def main():
                 yaxis_tickformat='$,.0f', 
                 height=400
             )
-            st.plotly_chart(fig_rolling, use_container_width=True)
+            show_chart(fig_rolling)
 
         # 40. Vendor Spend Pareto
         st.subheader("40. Vendor Spend Pareto Analysis")
@@ -1256,7 +1375,7 @@ def main():
             vendor_data = filtered.copy()
             vendor_data['Vendor'] = vendor_data['Part Name'].apply(lambda x: vendors[hash(x) % len(vendors)])
             
-            vendor_summary = vendor_data.groupby('Vendor')['Amount'].sum().reset_index()
+            vendor_summary = vendor_data.groupby('Vendor', observed=True)['Amount'].sum().reset_index()
             vendor_summary = vendor_summary.sort_values('Amount', ascending=False)
             vendor_summary['Cumulative'] = vendor_summary['Amount'].cumsum()
             vendor_summary['Cumulative %'] = vendor_summary['Cumulative'] / vendor_summary['Amount'].sum() * 100
@@ -1287,7 +1406,7 @@ def main():
                 yaxis2=dict(title='Cumulative %', overlaying='y', side='right', range=[0,100]),
                 height=400
             )
-            st.plotly_chart(fig_pareto, use_container_width=True)
+            show_chart(fig_pareto)
 
         # 41. Budget Reallocation Impact
         st.subheader("41. Budget Reallocation Impact Simulator")
@@ -1301,30 +1420,19 @@ def main():
                 realloc_amount = st.number_input('Reallocation Amount ($)', min_value=0, max_value=50000, value=5000, step=1000)
             
             if st.button('🔄 Show Reallocation Impact', key="show_realloc"):
-                before_util = []
-                after_util = []
-                group_names = []
+                group_names = list(groups)
+                original_budgets = budgets_arr
+                actual_spent = spent_arr
                 
-                for group_name in groups:
-                    key = group_name.strip().lower()
-                    original_budget = BUDGETS.get(key, 0)
-                    actual_spent = filtered[filtered['Group Name'] == group_name]['Amount'].sum()
-                    
-                    # Calculate new budget after reallocation
-                    if group_name == source_group:
-                        new_budget = original_budget - realloc_amount
-                    elif group_name == target_group:
-                        new_budget = original_budget + realloc_amount
-                    else:
-                        new_budget = original_budget
-                    
-                    # Calculate utilization percentages
-                    before_pct = (actual_spent / original_budget * 100) if original_budget > 0 else 0
-                    after_pct = (actual_spent / new_budget * 100) if new_budget > 0 else 0
-                    
-                    group_names.append(group_name)
-                    before_util.append(before_pct)
-                    after_util.append(after_pct)
+                # Calculate new budgets after reallocation
+                is_source = np.array([g == source_group for g in group_names])
+                is_target = np.array([g == target_group for g in group_names])
+                new_budgets = original_budgets - realloc_amount * is_source + realloc_amount * is_target
+                
+                # Calculate utilization percentages (0 where the budget is not positive)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    before_util = np.where(original_budgets > 0, actual_spent / original_budgets * 100, 0.0)
+                    after_util = np.where(new_budgets > 0, actual_spent / new_budgets * 100, 0.0)
                 
                 fig_impact = go.Figure()
                 fig_impact.add_trace(go.Bar(
@@ -1345,44 +1453,40 @@ def main():
                     barmode='group', 
                     yaxis_title='Utilization %',
                     height=400,
-                    yaxis=dict(range=[0, max(max(before_util), max(after_util)) * 1.1])
+                    yaxis=dict(range=[0, max(before_util.max(), after_util.max()) * 1.1])
+                )
+                show_chart(fig_impact)
+                
+                # Show summary table; numeric columns are formatted by the frontend
+                summary_df = pd.DataFrame({
+                    "Group": group_names,
+                    "Before %": before_util,
+                    "After %": after_util,
+                    "Change": after_util - before_util,
+                })
+                st.dataframe(
+                    summary_df,
+                    width="stretch",
+                    column_config={
+                        "Before %": st.column_config.NumberColumn(format="%.1f%%"),
+                        "After %": st.column_config.NumberColumn(format="%.1f%%"),
+                        "Change": st.column_config.NumberColumn(format="%+.1f%%"),
+                    },
                 )
-                st.plotly_chart(fig_impact, use_container_width=True)
-                
-                # Show summary table
-                summary_data = []
-                for i, group in enumerate(group_names):
-                    summary_data.append({
-                        "Group": group,
-                        "Before %": f"{before_util[i]:.1f}%",
-                        "After %": f"{after_util[i]:.1f}%",
-                        "Change": f"{after_util[i] - before_util[i]:+.1f}%"
-                    })
-                st.dataframe(pd.DataFrame(summary_data), use_container_width=True)
 
         # ===== EXECUTIVE SUMMARY CARDS =====
         st.markdown("---")
         st.header("📊 Executive Summary Dashboard")
         
-        # Calculate key metrics
-        total_spent = filtered['Amount'].sum()
+        # Calculate key metrics (cached on the filtered slice)
+        summary = compute_summary(filtered, actuals_by_group, budget_by_name)
+        total_spent = summary["total_spent"]
         total_budget = sum(BUDGETS.values())
         remaining_budget = total_budget - total_spent
-        burn_rate = total_spent / len(filtered['Date'].unique()) if len(filtered['Date'].unique()) > 0 else 0
-        
-        # Top spending group
-        group_totals = filtered.groupby('Group Name')['Amount'].sum()
-        top_group = group_totals.idxmax() if not group_totals.empty else "N/A"
-        top_group_amount = group_totals.max() if not group_totals.empty else 0
-        
-        # Risk assessment
-        over_budget_groups = []
-        for group_name in groups:
-            key = group_name.strip().lower()
-            budget = BUDGETS.get(key, 0)
-            spent = filtered[filtered['Group Name'] == group_name]['Amount'].sum()
-            if spent > budget:
-                over_budget_groups.append(group_name)
+        burn_rate = summary["burn_rate"]
+        top_group = summary["top_group"]
+        top_group_amount = summary["top_group_amount"]
+        over_budget_groups = summary["over_budget_groups"]
         
         # Summary cards in columns
         col1, col2, col3, col4 = st.columns(4)
@@ -1454,35 +1558,20 @@ def main():
             st.info(f"**Budget Health**: {len(groups) - len(over_budget_groups)}/{len(groups)} groups are within budget")
             
             if burn_rate > 0:
-                projected_month_end = total_spent + (burn_rate * (30 - len(filtered['Date'].unique())))
+                projected_month_end = total_spent + (burn_rate * (30 - summary["n_days"]))
                 st.info(f"**Month-End Projection**: ${projected_month_end:,.0f} total spending expected")
             
             # Efficiency insights
-            most_efficient = None
-            best_efficiency = float('inf')
-            for group_name in groups:
-                key = group_name.strip().lower()
-                budget = BUDGETS.get(key, 0)
-                spent = filtered[filtered['Group Name'] == group_name]['Amount'].sum()
-                if budget > 0:
-                    efficiency_pct = (spent / budget) * 100
-                    if efficiency_pct < best_efficiency and spent > 0:
-                        best_efficiency = efficiency_pct
-                        most_efficient = group_name
-            
-            if most_efficient:
-                st.success(f"**Most Efficient**: {most_efficient} at {best_efficiency:.1f}% budget utilization")
+            if summary["most_efficient"]:
+                st.success(f"**Most Efficient**: {summary['most_efficient']} at {summary['best_efficiency']:.1f}% budget utilization")
         
         with insights_col2:
             if over_budget_groups:
                 st.warning(f"**Action Required**: {', '.join(over_budget_groups)} exceed{'s' if len(over_budget_groups) == 1 else ''} budget")
             
             # Spending trend
-            if len(filtered) > 1:
-                recent_days = filtered[filtered['Date'] >= filtered['Date'].max() - pd.Timedelta(days=3)]
-                recent_spend = recent_days['Amount'].sum()
-                recent_avg = recent_spend / 3 if len(recent_days) > 0 else 0
-                
+            recent_avg = summary["recent_avg"]
+            if recent_avg is not None:
                 if recent_avg > burn_rate * 1.2:
                     st.warning(f"**Spending Spike**: Recent 3-day average (${recent_avg:,.0f}/day) is 20%+ above normal")
                 elif recent_avg < burn_rate * 0.8:
@@ -1490,7 +1579,7 @@ def main():
             
             # Budget optimization suggestion
             if remaining_budget > 0:
-                days_left = 30 - len(filtered['Date'].unique())
+                days_left = 30 - summary["n_days"]
                 recommended_daily = remaining_budget / days_left if days_left > 0 else 0
                 if recommended_daily < burn_rate:
                     st.warning(f"**Pace Adjustment**: Reduce to ${recommended_daily:,.0f}/day to stay on budget")
@@ -1499,198 +1588,150 @@ def main():
         st.markdown("---")
         st.header("📋 Group-Level Executive Summaries")
         
-        # Create tabs for each group
-        group_tabs = st.tabs(list(groups))
-        
-        for idx, group_name in enumerate(groups):
-            with group_tabs[idx]:
-                # Filter data for this group
-                group_data = filtered[filtered['Group Name'] == group_name]
-                group_key = group_name.strip().lower()
-                group_budget = BUDGETS.get(group_key, 0)
-                group_spent = group_data['Amount'].sum()
-                group_remaining = group_budget - group_spent
-                
-                # Group metrics
-                st.subheader(f"💼 {group_name} Summary")
-                
-                # Top row metrics
-                gcol1, gcol2, gcol3, gcol4 = st.columns(4)
-                
-                with gcol1:
-                    utilization = (group_spent / group_budget * 100) if group_budget > 0 else 0
-                    status = "🔴 Over" if utilization > 100 else "🟡 Warning" if utilization > 80 else "🟢 On Track"
-                    st.metric(
-                        label="💰 Total Spent",
-                        value=f"${group_spent:,.0f}",
-                        delta=f"${group_budget:,.0f} budget"
-                    )
-                    st.metric(
-                        label="📊 Budget Status",
-                        value=status,
-                        delta=f"{utilization:.1f}% utilized"
-                    )
-                
-                with gcol2:
-                    group_transactions = len(group_data)
-                    avg_transaction = group_spent / group_transactions if group_transactions > 0 else 0
-                    st.metric(
-                        label="🔢 Transactions",
-                        value=f"{group_transactions}",
-                        delta=f"${avg_transaction:,.0f} avg"
-                    )
-                    
-                    daily_spend = group_spent / len(group_data['Date'].unique()) if len(group_data['Date'].unique()) > 0 else 0
-                    st.metric(
-                        label="📅 Daily Burn",
-                        value=f"${daily_spend:,.0f}",
-                        delta="per day"
-                    )
-                
-                with gcol3:
-                    st.metric(
-                        label="💵 Remaining",
-                        value=f"${group_remaining:,.0f}",
-                        delta=f"{(group_remaining/group_budget*100):.1f}% left" if group_budget > 0 else "N/A"
-                    )
-                    
-                    # Days remaining at current pace
-                    runway_days = group_remaining / daily_spend if daily_spend > 0 and group_remaining > 0 else 0
-                    runway_text = f"{runway_days:.0f} days" if runway_days > 0 else "Budget exhausted" if group_remaining <= 0 else "∞ days"
-                    st.metric(
-                        label="⏳ Runway",
-                        value=runway_text,
-                        delta="at current pace"
-                    )
-                
-                with gcol4:
-                    # Top part for this group
-                    if not group_data.empty:
-                        top_part = group_data.groupby('Part Name')['Amount'].sum().idxmax()
-                        top_part_amount = group_data.groupby('Part Name')['Amount'].sum().max()
-                        st.metric(
-                            label="🏆 Top Part",
-                            value=top_part[:15] + "..." if len(top_part) > 15 else top_part,
-                            delta=f"${top_part_amount:,.0f}"
-                        )
-                    
-                    # Risk assessment for group
-                    risk = "🔴 HIGH" if utilization > 100 else "🟡 MEDIUM" if utilization > 80 else "🟢 LOW"
-                    st.metric(
-                        label="⚠️ Risk Level",
-                        value=risk,
-                        delta="budget risk"
-                    )
-                
-                # Group-specific charts
-                if not group_data.empty:
-                    chart_col1, chart_col2 = st.columns(2)
-                    
-                    with chart_col1:
-                        # Daily spending trend for this group
-                        daily_group = group_data.groupby('Date')['Amount'].sum().reset_index()
-                        daily_group['Day'] = pd.to_datetime(daily_group['Date']).dt.day
-                        
-                        fig_trend = px.line(
-                            daily_group, 
-                            x='Day', 
-                            y='Amount',
-                            title=f'{group_name} Daily Spending Trend',
-                            markers=True
-                        )
-                        fig_trend.update_layout(height=250, yaxis_tickformat='$,.0f')
-                        st.plotly_chart(fig_trend, use_container_width=True)
-                    
-                    with chart_col2:
-                        # Top parts breakdown for this group
-                        parts_breakdown = group_data.groupby('Part Name')['Amount'].sum().sort_values(ascending=False).head(5)
-                        
-                        fig_parts = px.pie(
-                            values=parts_breakdown.values,
-                            names=parts_breakdown.index,
-                            title=f'{group_name} Top 5 Parts'
-                        )
-                        fig_parts.update_layout(height=250, showlegend=False)
-                        fig_parts.update_traces(textposition='inside', textinfo='percent+label')
-                        st.plotly_chart(fig_parts, use_container_width=True)
-                
-                # Group insights
-                st.subheader("🔍 Key Insights")
-                insight_col1, insight_col2 = st.columns(2)
-                
-                with insight_col1:
-                    # Performance vs other groups
-                    all_group_util = {}
-                    for g in groups:
-                        gk = g.strip().lower()
-                        gb = BUDGETS.get(gk, 0)
-                        gs = filtered[filtered['Group Name'] == g]['Amount'].sum()
-                        if gb > 0:
-                            all_group_util[g] = (gs / gb * 100)
-                    
-                    if all_group_util:
-                        group_rank = sorted(all_group_util.items(), key=lambda x: x[1])
-                        group_position = next((i+1 for i, (name, _) in enumerate(group_rank) if name == group_name), 0)
-                        st.info(f"**Efficiency Ranking**: #{group_position} out of {len(groups)} groups")
-                    
-                    # Recent activity
-                    if len(group_data) > 1:
-                        recent_days = 3
-                        recent_data = group_data[group_data['Date'] >= group_data['Date'].max() - pd.Timedelta(days=recent_days-1)]
-                        recent_avg = recent_data['Amount'].sum() / recent_days
-                        
-                        if recent_avg > daily_spend * 1.3:
-                            st.warning(f"**Recent Spike**: ${recent_avg:,.0f}/day in last {recent_days} days (+30%)")
-                        elif recent_avg < daily_spend * 0.7:
-                            st.info(f"**Reduced Activity**: ${recent_avg:,.0f}/day in last {recent_days} days (-30%)")
-                        else:
-                            st.success(f"**Steady Pace**: ${recent_avg:,.0f}/day in last {recent_days} days")
-                
-                with insight_col2:
-                    # Recommendations
-                    if utilization > 100:
-                        overspend = group_spent - group_budget
-                        st.error(f"**Over Budget**: ${overspend:,.0f} over limit - immediate action required")
-                    elif utilization > 90:
-                        st.warning(f"**Near Limit**: Only ${group_remaining:,.0f} remaining - monitor closely")
-                    elif utilization < 50:
-                        st.success(f"**Under-utilized**: ${group_remaining:,.0f} available for additional projects")
-                    
-                    # Forecasting
-                    days_left_in_month = 30 - len(group_data['Date'].unique())
-                    if days_left_in_month > 0 and daily_spend > 0:
-                        projected_total = group_spent + (daily_spend * days_left_in_month)
-                        projected_util = (projected_total / group_budget * 100) if group_budget > 0 else 0
-                        
-                        if projected_util > 100:
-                            st.warning(f"**Projection**: Will exceed budget by ${projected_total - group_budget:,.0f}")
-                        else:
-                            st.info(f"**Projection**: Will use {projected_util:.1f}% of budget by month-end")
-                
-                # Action items for this group
-                st.subheader("📋 Action Items")
-                action_items = []
-                
-                if utilization > 100:
-                    action_items.append("🔴 **URGENT**: Review and halt non-essential spending")
-                elif utilization > 85:
-                    action_items.append("🟡 **MONITOR**: Approve only critical expenses")
-                
-                if not group_data.empty:
-                    large_transactions = group_data[group_data['Amount'] > avg_transaction * 2]
-                    if len(large_transactions) > 0:
-                        action_items.append(f"🔍 **REVIEW**: {len(large_transactions)} transactions above 2x average")
-                
-                if daily_spend > 0:
-                    recommended_daily = group_remaining / days_left_in_month if days_left_in_month > 0 else 0
-                    if recommended_daily < daily_spend * 0.8:
-                        action_items.append(f"📉 **REDUCE**: Cut daily spending to ${recommended_daily:,.0f} to stay on budget")
-                
-                if not action_items:
-                    action_items.append("✅ **ON TRACK**: Continue current spending patterns")
-                
-                for item in action_items:
-                    st.markdown(f"- {item}")
+        # Efficiency ranking across groups does not depend on the selected group
+        budgeted = budgets_arr > 0
+        ranked_names = np.array(groups, dtype=object)[budgeted][np.argsort(util_arr[budgeted], kind="stable")]
+        util_rank = {name: rank for rank, name in enumerate(ranked_names, start=1)}
+        # Burn rate, runway and month-end projection for all groups in one pass
+        daily_arr, runway_arr, days_left_arr, projected_total_arr, projected_util_arr, projection_status = project_groups(
+            spent_arr,
+            budgets_arr,
+            active_days_by_group.reindex(groups, fill_value=0).to_numpy(dtype=np.float64),
+        )
+        
+        # Daily trends for all groups share one faceted figure
+        fig_trend = pio.from_json(group_trends_figure_json(daily_usage))
+        show_chart(fig_trend)
+        
+        # Transactions above twice their group's average, counted for all groups at once
+        row_group = pd.Categorical(filtered["Group Name"], categories=groups).codes
+        avg_by_group = spent_arr / np.maximum(np.bincount(row_group, minlength=len(groups)), 1)
+        large_counts = np.bincount(
+            row_group, weights=amounts > avg_by_group[row_group] * 2, minlength=len(groups)
+        ).astype(int)
+        severity, review, reduce, on_track, recommended_arr = plan_actions(
+            util_arr, daily_arr, budgets_arr - spent_arr, days_left_arr, large_counts
+        )
+        
+        # st.tabs runs every tab body on each rerun, so pick one group and render only it
+        group_name = st.radio("Group", groups, horizontal=True, key="group_pick")
+        # Filter data for this group
+        group_data = filtered[filtered['Group Name'] == group_name]
+        gi = groups.index(group_name)
+        group_budget = budget_by_name[group_name]
+        # Amounts for this group as a plain ndarray for the scalar reductions below
+        group_amounts = group_data['Amount'].to_numpy()
+        group_spent = group_amounts.sum()
+        group_remaining = group_budget - group_spent
+        # One Part Name aggregation shared by the top-part metric and the parts pie
+        parts_sum = group_data.groupby('Part Name', sort=False, observed=True)['Amount'].sum()
+        
+        # Group metrics
+        st.subheader(f"💼 {group_name} Summary")
+        
+        # Group KPIs, rendered as one table instead of eight separate metric widgets
+        utilization = (group_spent / group_budget * 100) if group_budget > 0 else 0
+        status = "🔴 Over" if utilization > 100 else "🟡 Warning" if utilization > 80 else "🟢 On Track"
+        group_transactions = len(group_data)
+        avg_transaction = group_spent / group_transactions if group_transactions > 0 else 0
+        daily_spend = daily_arr[gi]
+        # Days remaining at current pace
+        runway_days = runway_arr[gi]
+        runway_text = f"{runway_days:.0f} days" if runway_days > 0 else "Budget exhausted" if group_remaining <= 0 else "∞ days"
+        risk = "🔴 HIGH" if utilization > 100 else "🟡 MEDIUM" if utilization > 80 else "🟢 LOW"
+        
+        group_kpis = {
+            "💰 Total Spent": (f"${group_spent:,.0f}", f"${group_budget:,.0f} budget"),
+            "📊 Budget Status": (status, f"{utilization:.1f}% utilized"),
+            "🔢 Transactions": (f"{group_transactions}", f"${avg_transaction:,.0f} avg"),
+            "📅 Daily Burn": (f"${daily_spend:,.0f}", "per day"),
+            "💵 Remaining": (f"${group_remaining:,.0f}", f"{(group_remaining/group_budget*100):.1f}% left" if group_budget > 0 else "N/A"),
+            "⏳ Runway": (runway_text, "at current pace"),
+        }
+        if not group_data.empty:
+            # Top part for this group
+            top_part = parts_sum.idxmax()
+            group_kpis["🏆 Top Part"] = (top_part[:15] + "..." if len(top_part) > 15 else top_part, f"${parts_sum.max():,.0f}")
+        group_kpis["⚠️ Risk Level"] = (risk, "budget risk")
+        st.dataframe(
+            pd.DataFrame([(label, value, detail) for label, (value, detail) in group_kpis.items()], columns=["Metric", "Value", "Detail"]),
+            hide_index=True,
+            width="stretch",
+        )
+        
+        # Top parts breakdown for this group; five rows do not need a Plotly figure
+        if not group_data.empty:
+            parts_breakdown = parts_sum.nlargest(5)
+            st.markdown(f"**{group_name} Top 5 Parts**")
+            st.dataframe(
+                parts_breakdown.rename_axis("Part Name").rename("Amount").reset_index(),
+                hide_index=True,
+                width="stretch",
+                column_config={
+                    "Amount": st.column_config.ProgressColumn(
+                        format="$%.0f",
+                        min_value=0,
+                        max_value=float(parts_breakdown.iloc[0]),
+                    ),
+                },
+            )
+        
+        # Group insights
+        st.subheader("🔍 Key Insights")
+        insight_col1, insight_col2 = st.columns(2)
+        
+        with insight_col1:
+            # Performance vs other groups
+            if util_rank:
+                group_position = util_rank.get(group_name, 0)
+                st.info(f"**Efficiency Ranking**: #{group_position} out of {len(groups)} groups")
+            
+            # Recent activity
+            if len(group_data) > 1:
+                recent_days = 3
+                # group_data keeps filtered's date order, so the window is a tail slice
+                group_dates = group_data['Date'].to_numpy(dtype="datetime64[D]")
+                cutoff = group_dates[-1] - np.timedelta64(recent_days - 1, "D")
+                recent_avg = group_amounts[np.searchsorted(group_dates, cutoff):].sum() / recent_days
+                
+                if recent_avg > daily_spend * 1.3:
+                    st.warning(f"**Recent Spike**: ${recent_avg:,.0f}/day in last {recent_days} days (+30%)")
+                elif recent_avg < daily_spend * 0.7:
+                    st.info(f"**Reduced Activity**: ${recent_avg:,.0f}/day in last {recent_days} days (-30%)")
+                else:
+                    st.success(f"**Steady Pace**: ${recent_avg:,.0f}/day in last {recent_days} days")
+        
+        with insight_col2:
+            # Recommendations
+            if utilization > 100:
+                overspend = group_spent - group_budget
+                st.error(f"**Over Budget**: ${overspend:,.0f} over limit - immediate action required")
+            elif utilization > 90:
+                st.warning(f"**Near Limit**: Only ${group_remaining:,.0f} remaining - monitor closely")
+            elif utilization < 50:
+                st.success(f"**Under-utilized**: ${group_remaining:,.0f} available for additional projects")
+            
+            # Forecasting
+            if projection_status[gi] == 2:
+                st.warning(f"**Projection**: Will exceed budget by ${projected_total_arr[gi] - group_budget:,.0f}")
+            elif projection_status[gi] == 1:
+                st.info(f"**Projection**: Will use {projected_util_arr[gi]:.1f}% of budget by month-end")
+        
+        # Action items for this group
+        st.subheader("📋 Action Items")
+        action_items = []
+        
+        if severity[gi]:
+            action_items.append(SEVERITY_ACTIONS[severity[gi]])
+        if review[gi]:
+            action_items.append(f"🔍 **REVIEW**: {large_counts[gi]} transactions above 2x average")
+        if reduce[gi]:
+            action_items.append(f"📉 **REDUCE**: Cut daily spending to ${recommended_arr[gi]:,.0f} to stay on budget")
+        if on_track[gi]:
+            action_items.append("✅ **ON TRACK**: Continue current spending patterns")
+        
+        for item in action_items:
+            st.markdown(f"- {item}")
 
 
 if __name__ == "__main__":
@@ -3,6 +3,34 @@ import json
 import getpass
 from datetime import datetime
 import os
+import gzip
+import heapq
+import time
+import stat
+import tempfile
+import threading
+
+# orjson parses and serialises several times faster; fall back to stdlib json without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Ideas snapshot, stored gzipped (level 1) since the repetitive review keys compress well
+IDEAS_FILE = 'ideas.json.gz'
+# Points as sorted "user<TAB>count" lines: no JSON parser needed for a flat counter
+POINTS_FILE = 'points.tsv'
+# Review and training clicks are appended here instead of rewriting the ideas snapshot
+EVENTS_FILE = 'events.jsonl'
+# The log is renamed to this while it is folded into the snapshot, so new clicks start a fresh log
+FOLDING_FILE = EVENTS_FILE + '.folding'
+# Fold the event log back into the ideas snapshot once it reaches this many entries
+COMPACT_EVERY = 200
+# Review cards shown per page
+REVIEW_PAGE_SIZE = 25
+
+# Single-pass HTML escaping for user-supplied report fields
+HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
 
 # Set page config
 st.set_page_config(page_title="Tribal Ideas", page_icon="💡", layout="wide")
@@ -19,33 +47,199 @@ def initialize_json_files():
         with open('roles.json', 'w') as f:
             json.dump(default_roles, f, indent=2)
     
-    # Initialize ideas.json
-    if not os.path.exists('ideas.json'):
-        with open('ideas.json', 'w') as f:
-            json.dump([], f, indent=2)
+    # Initialize the ideas snapshot, migrating a plain ideas.json if one exists
+    if not os.path.exists(IDEAS_FILE):
+        save_json(IDEAS_FILE, load_json('ideas.json') if os.path.exists('ideas.json') else [])
     
-    # Initialize points.json
-    if not os.path.exists('points.json'):
-        with open('points.json', 'w') as f:
-            json.dump({}, f, indent=2)
+    # Initialize the points file, migrating a legacy points.json if one exists
+    if not os.path.exists(POINTS_FILE):
+        save_points(load_json('points.json') if os.path.exists('points.json') else {})
+
+# Parsed file contents are cached per modification time, so reruns skip the disk read
+@st.cache_data(show_spinner=False)
+def read_json_cached(filename, mtime_ns):
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def load_json(filename):
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
-    except:
-        return {} if filename == 'points.json' else []
+        return read_json_cached(filename, os.stat(filename).st_mtime_ns)
+    except FileNotFoundError:
+        # A missing file is empty; a corrupt one should fail loudly rather than look empty
+        return {} if filename in ('points.json', 'roles.json') else []
+
+# Writes go to a unique temp file that is synced and then renamed over the target, so a
+# crash never leaves it half-written and concurrent sessions never share a temp file
+def write_atomic(filename, raw):
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                                        prefix=os.path.basename(filename) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if filename.endswith('.gz'):
+                with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=1) as gz:
+                    gz.write(raw)
+            else:
+                f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only; keep the target's mode instead
+        try:
+            mode = stat.S_IMODE(os.stat(filename).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_filename, mode)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+# Compact output by default; pass pretty=True for files meant to be edited by hand.
+def save_json(filename, data, pretty=False):
+    if orjson is not None:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        raw = json.dumps(data, indent=2).encode('utf-8')
+    else:
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    write_atomic(filename, raw)
+    # Drop cached parses in case the write lands within the same mtime tick
+    read_json_cached.clear()
+
+@st.cache_data(show_spinner=False)
+def read_points_cached(filename, mtime_ns):
+    points = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            user, _, count = line.rstrip('\n').partition('\t')
+            if user:
+                points[user] = int(count)
+    return points
+
+def load_points():
+    try:
+        return read_points_cached(POINTS_FILE, os.stat(POINTS_FILE).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+def save_points(points):
+    raw = ''.join(f"{user}\t{count}\n" for user, count in sorted(points.items()))
+    write_atomic(POINTS_FILE, raw.encode('utf-8'))
+    read_points_cached.clear()
+
+@st.cache_data(show_spinner=False)
+def read_jsonl_cached(filename, mtime_ns):
+    with open(filename, 'rb') as f:
+        loads = orjson.loads if orjson is not None else json.loads
+        return [loads(line) for line in f if line.strip()]
 
-def save_json(filename, data):
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+def load_events(filename=EVENTS_FILE):
+    try:
+        return read_jsonl_cached(filename, os.stat(filename).st_mtime_ns)
+    except FileNotFoundError:
+        return []
+
+# Serialises folds and appends across sessions; each session runs in its own thread of one process
+@st.cache_resource
+def fold_lock():
+    return threading.Lock()
+
+def append_event(event):
+    if orjson is not None:
+        line = orjson.dumps(event) + b"\n"
+    else:
+        line = (json.dumps(event, separators=(',', ':')) + "\n").encode('utf-8')
+    # Held so a fold cannot rename the log between opening it and writing the line
+    with fold_lock():
+        with open(EVENTS_FILE, 'ab') as f:
+            f.write(line)
+    read_jsonl_cached.clear()
+    if len(load_events()) >= COMPACT_EVERY:
+        fold_events()
+
+def apply_events(ideas, events):
+    by_id = {idea['id']: idea for idea in ideas}
+    for event in events:
+        idea = by_id.get(event['idea_id'])
+        if idea is None:
+            continue
+        if event['type'] == 'review':
+            review = {
+                "reviewer": event['reviewer'],
+                "accurate": event['accurate'],
+                "reviewed_at": event['reviewed_at']
+            }
+            # Replaying an event the snapshot already holds (e.g. after a crash mid-fold) is a no-op
+            if review not in idea['reviews']:
+                idea['reviews'].append(review)
+        elif event['type'] == 'train':
+            idea['trained'] = True
+            idea['trained_by'] = event['trained_by']
+            idea['trained_at'] = event['trained_at']
+    return ideas
+
+# Current ideas: the snapshot with any log being folded and the live log replayed on top.
+# The logs are read before the snapshot, so a fold finishing in between only causes a
+# replay of events the new snapshot already holds, which apply_events skips.
+def load_ideas():
+    events = load_events()
+    folding = load_events(FOLDING_FILE)
+    ideas = load_json(IDEAS_FILE)
+    apply_events(ideas, folding)
+    apply_events(ideas, events)
+    return ideas
+
+# Fold the event log into the snapshot, adding any new ideas. The log is renamed aside
+# first, so clicks appended meanwhile go to a fresh log instead of being deleted with it.
+# Only called from write paths, never while rendering.
+def fold_events(new_ideas=()):
+    with fold_lock():
+        # A leftover log from an interrupted fold is finished first rather than overwritten
+        if not os.path.exists(FOLDING_FILE) and os.path.exists(EVENTS_FILE):
+            os.replace(EVENTS_FILE, FOLDING_FILE)
+        ideas = apply_events(load_json(IDEAS_FILE), load_events(FOLDING_FILE))
+        ideas.extend(new_ideas)
+        save_json(IDEAS_FILE, ideas)
+        if os.path.exists(FOLDING_FILE):
+            os.remove(FOLDING_FILE)
+        read_jsonl_cached.clear()
+
+def file_mtime_ns(filename):
+    try:
+        return os.stat(filename).st_mtime_ns
+    except OSError:
+        return 0
+
+# Lowercased (id, text, tag) per idea; text and tag only change when the snapshot is rewritten.
+# Older snapshots are never searched again, so only the latest index is kept.
+@st.cache_data(show_spinner=False, max_entries=1)
+def build_search_index(ideas_mtime_ns):
+    return [(idea['id'], idea['text'].lower(), idea['tag'].lower()) for idea in load_json(IDEAS_FILE)]
+
+# Timestamps are stored as epoch nanoseconds; older records hold ISO strings
+def format_ts(value):
+    if isinstance(value, str):
+        return value
+    return datetime.fromtimestamp(value / 1e9).isoformat()
 
 def get_current_user():
     return getpass.getuser().lower()
 
+# Roles change rarely; keep them in process memory and reload only when roles.json changes.
+# Streamlit re-executes this module on every rerun, so the holder lives in cache_resource.
+@st.cache_resource
+def roles_cache():
+    return {"mtime_ns": None, "data": {}}
+
 def get_user_role(username):
-    roles = load_json('roles.json')
-    return roles.get(username, None)
+    cache = roles_cache()
+    mtime_ns = file_mtime_ns('roles.json')
+    if cache["mtime_ns"] != mtime_ns:
+        cache["data"] = load_json('roles.json')
+        cache["mtime_ns"] = mtime_ns
+    return cache["data"].get(username, None)
 
 def submitter_page():
     st.header("💡 Submit New Idea")
@@ -76,29 +270,28 @@ def submitter_page():
                     st.error("Please select a tag.")
                     return
                 
-                ideas = load_json('ideas.json')
+                ideas = load_ideas()
                 new_idea = {
                     "id": len(ideas) + 1,
                     "text": idea_text.strip(),
                     "link": link.strip() if link.strip() else None,
                     "tag": tag.strip(),
                     "submitter": get_current_user(),
-                    "submitted_at": datetime.now().isoformat(),
+                    "submitted_at": time.time_ns(),
                     "reviews": [],
                     "trained": False
                 }
-                ideas.append(new_idea)
-                save_json('ideas.json', ideas)
+                fold_events([new_idea])
+                # The review and train pages render after this one and load the new idea
+                # in this same run, so no rerun is needed (it also kept the message from showing)
                 st.success("✅ Idea submitted successfully!")
-                st.rerun()
             else:
                 st.error("Please enter an idea text.")
 
 def reviewer_page():
     st.header("🔍 Review Ideas")
     
-    ideas = load_json('ideas.json')
-    points = load_json('points.json')
+    ideas = load_ideas()
     current_user = get_current_user()
     
     # Search functionality
@@ -106,9 +299,10 @@ def reviewer_page():
     
     # Filter ideas based on search
     if search_term:
-        filtered_ideas = [idea for idea in ideas if 
-                         search_term.lower() in idea['text'].lower() or 
-                         search_term.lower() in idea['tag'].lower()]
+        needle = search_term.lower()
+        matches = {idea_id for idea_id, text, tag in build_search_index(file_mtime_ns(IDEAS_FILE))
+                   if needle in text or needle in tag}
+        filtered_ideas = [idea for idea in ideas if idea['id'] in matches]
     else:
         filtered_ideas = ideas
     
@@ -116,66 +310,76 @@ def reviewer_page():
         st.info("No ideas found.")
         return
     
+    # Only render one page of cards per run
+    page_count = -(-len(filtered_ideas) // REVIEW_PAGE_SIZE)
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        st.caption(f"{len(filtered_ideas)} ideas, page {page} of {page_count}")
+        filtered_ideas = filtered_ideas[(page - 1) * REVIEW_PAGE_SIZE:page * REVIEW_PAGE_SIZE]
+    
+    # Ideas this user has already reviewed, collected in one pass over all reviews
+    reviewed_ids = {idea['id'] for idea in ideas
+                    for review in idea['reviews'] if review['reviewer'] == current_user}
+    
     # Display ideas in cards
-    for i, idea in enumerate(filtered_ideas):
-        with st.expander(f"💡 {idea['tag']} - ID: {idea['id']}"):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Idea:** {idea['text']}")
-                if idea['link']:
-                    st.write(f"**Link:** {idea['link']}")
-                st.write(f"**Submitter:** {idea['submitter']}")
-                st.write(f"**Submitted:** {idea['submitted_at'][:10]}")
-                
-                # Show existing reviews
-                if idea['reviews']:
-                    st.write("**Previous Reviews:**")
-                    for review in idea['reviews']:
-                        st.write(f"- {review['reviewer']}: {'✅ Accurate' if review['accurate'] else '❌ Not Accurate'}")
+    for idea in filtered_ideas:
+        review_card(idea, current_user, reviewed_ids)
+
+def record_review(idea, current_user, accurate, reviewed_ids):
+    review = {
+        "reviewer": current_user,
+        "accurate": accurate,
+        "reviewed_at": time.time_ns()
+    }
+    append_event({"type": "review", "idea_id": idea['id'], **review})
+    idea['reviews'].append(review)
+    reviewed_ids.add(idea['id'])
+    # Update points
+    points = load_points()
+    points[current_user] = points.get(current_user, 0) + 5
+    save_points(points)
+
+# A review click only reruns its own card, not the whole list of ideas
+@st.fragment
+def review_card(idea, current_user, reviewed_ids):
+    with st.expander(f"💡 {idea['tag']} - ID: {idea['id']}"):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.write(f"**Idea:** {idea['text']}")
+            if idea['link']:
+                st.write(f"**Link:** {idea['link']}")
+            st.write(f"**Submitter:** {idea['submitter']}")
+            st.write(f"**Submitted:** {format_ts(idea['submitted_at'])[:10]}")
             
-            with col2:
-                # Check if user already reviewed this idea
-                user_reviewed = any(review['reviewer'] == current_user for review in idea['reviews'])
-                
-                if not user_reviewed:
+            # Show existing reviews
+            if idea['reviews']:
+                st.write("**Previous Reviews:**")
+                for review in idea['reviews']:
+                    st.write(f"- {review['reviewer']}: {'✅ Accurate' if review['accurate'] else '❌ Not Accurate'}")
+        
+        with col2:
+            # Check if user already reviewed this idea
+            if idea['id'] not in reviewed_ids:
+                # Buttons sit in a placeholder so a click can swap them out in the same run
+                actions = st.empty()
+                with actions.container():
                     col_acc, col_not = st.columns(2)
                     with col_acc:
-                        if st.button("✅ Accurate", key=f"acc_{idea['id']}"):
-                            # Add review
-                            idea['reviews'].append({
-                                "reviewer": current_user,
-                                "accurate": True,
-                                "reviewed_at": datetime.now().isoformat()
-                            })
-                            # Update points
-                            points[current_user] = points.get(current_user, 0) + 5
-                            # Save data
-                            save_json('ideas.json', ideas)
-                            save_json('points.json', points)
-                            st.rerun()
-                    
+                        accurate = st.button("✅ Accurate", key=f"acc_{idea['id']}")
                     with col_not:
-                        if st.button("❌ Not Accurate", key=f"not_acc_{idea['id']}"):
-                            # Add review
-                            idea['reviews'].append({
-                                "reviewer": current_user,
-                                "accurate": False,
-                                "reviewed_at": datetime.now().isoformat()
-                            })
-                            # Update points
-                            points[current_user] = points.get(current_user, 0) + 5
-                            # Save data
-                            save_json('ideas.json', ideas)
-                            save_json('points.json', points)
-                            st.rerun()
-                else:
-                    st.success("Already reviewed")
+                        not_accurate = st.button("❌ Not Accurate", key=f"not_acc_{idea['id']}")
+                
+                if accurate or not_accurate:
+                    record_review(idea, current_user, accurate, reviewed_ids)
+                    actions.success("Review recorded")
+            else:
+                st.success("Already reviewed")
 
 def trainer_page():
     st.header("🎯 Training Management")
     
-    ideas = load_json('ideas.json')
+    ideas = load_ideas()
     current_user = get_current_user()
     
     # Filter for untraired ideas
@@ -188,38 +392,85 @@ def trainer_page():
     st.subheader(f"📚 {len(untrained_ideas)} ideas pending training")
     
     for idea in untrained_ideas:
-        with st.expander(f"💡 {idea['tag']} - ID: {idea['id']}"):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Idea:** {idea['text']}")
-                if idea['link']:
-                    st.write(f"**Link:** {idea['link']}")
-                st.write(f"**Submitter:** {idea['submitter']}")
-                st.write(f"**Submitted:** {idea['submitted_at'][:10]}")
-                
-                # Show reviews
-                if idea['reviews']:
-                    accurate_count = sum(1 for r in idea['reviews'] if r['accurate'])
-                    total_reviews = len(idea['reviews'])
-                    st.write(f"**Reviews:** {accurate_count}/{total_reviews} marked as accurate")
+        training_card(idea, current_user)
+
+# Marking an idea trained only reruns its own card
+@st.fragment
+def training_card(idea, current_user):
+    with st.expander(f"💡 {idea['tag']} - ID: {idea['id']}"):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.write(f"**Idea:** {idea['text']}")
+            if idea['link']:
+                st.write(f"**Link:** {idea['link']}")
+            st.write(f"**Submitter:** {idea['submitter']}")
+            st.write(f"**Submitted:** {format_ts(idea['submitted_at'])[:10]}")
             
-            with col2:
-                if st.button("✅ Mark Trained", key=f"train_{idea['id']}"):
-                    # Find and update the idea
-                    for i, orig_idea in enumerate(ideas):
-                        if orig_idea['id'] == idea['id']:
-                            ideas[i]['trained'] = True
-                            ideas[i]['trained_by'] = current_user
-                            ideas[i]['trained_at'] = datetime.now().isoformat()
-                            break
-                    save_json('ideas.json', ideas)
-                    st.rerun()
+            # Show reviews
+            if idea['reviews']:
+                accurate_count = sum(1 for r in idea['reviews'] if r['accurate'])
+                total_reviews = len(idea['reviews'])
+                st.write(f"**Reviews:** {accurate_count}/{total_reviews} marked as accurate")
+        
+        with col2:
+            actions = st.empty()
+            if actions.button("✅ Mark Trained", key=f"train_{idea['id']}"):
+                append_event({
+                    "type": "train",
+                    "idea_id": idea['id'],
+                    "trained_by": current_user,
+                    "trained_at": time.time_ns()
+                })
+                actions.success("Marked as trained")
+
+# One report table row; filled with %-formatting from a dict of pre-escaped fields
+REPORT_ROW = """
+                <tr>
+                    <td>%(id)s</td>
+                    <td><span class="tag">%(tag)s</span></td>
+                    <td>%(text)s</td>
+                    <td>%(link)s</td>
+                    <td>%(submitter)s</td>
+                    <td>%(submitted)s</td>
+                    <td>%(reviews)s</td>
+                    <td class="%(status_class)s">%(status)s</td>
+                </tr>
+        """
+
+# Table rows depend only on the stored ideas, so cache them per snapshot and event-log mtimes
+# Only the current state is ever requested again, so one entry is kept
+@st.cache_data(show_spinner=False, max_entries=1)
+def render_report_rows(ideas_mtime_ns, events_mtime_ns, folding_mtime_ns):
+    ideas = load_ideas()
+    parts = []
+    for idea in ideas:
+        reviews_text = f"{len(idea['reviews'])} reviews"
+        if idea['reviews']:
+            accurate_count = sum(1 for r in idea['reviews'] if r['accurate'])
+            reviews_text += f" ({accurate_count} accurate)"
+        
+        link_text = f'<a href="{idea["link"].translate(HTML_ESCAPE)}" target="_blank">Link</a>' if idea.get('link') else 'N/A'
+        
+        parts.append(REPORT_ROW % {
+            "id": idea['id'],
+            "tag": idea['tag'].translate(HTML_ESCAPE),
+            "text": idea['text'].translate(HTML_ESCAPE),
+            "link": link_text,
+            "submitter": idea['submitter'].translate(HTML_ESCAPE),
+            "submitted": format_ts(idea['submitted_at'])[:10],
+            "reviews": reviews_text,
+            "status_class": "trained" if idea['trained'] else "pending",
+            "status": "Trained" if idea['trained'] else "Pending",
+        })
+    return len(ideas), "".join(parts).encode('utf-8')
 
 def generate_html_report():
-    ideas = load_json('ideas.json')
+    idea_count, rows = render_report_rows(file_mtime_ns(IDEAS_FILE), file_mtime_ns(EVENTS_FILE),
+                                         file_mtime_ns(FOLDING_FILE))
     
-    html_content = f"""
+    # Assembled as UTF-8 bytes: cached rows are already encoded, so only the header/footer are
+    html_content = bytearray(f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -237,7 +488,7 @@ def generate_html_report():
     <body>
         <h1>Tribal Ideas Report</h1>
         <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p>Total Ideas: {len(ideas)}</p>
+        <p>Total Ideas: {idea_count}</p>
         
         <table>
             <thead>
@@ -253,43 +504,19 @@ def generate_html_report():
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for idea in ideas:
-        reviews_text = f"{len(idea['reviews'])} reviews"
-        if idea['reviews']:
-            accurate_count = sum(1 for r in idea['reviews'] if r['accurate'])
-            reviews_text += f" ({accurate_count} accurate)"
-        
-        status = "Trained" if idea['trained'] else "Pending"
-        status_class = "trained" if idea['trained'] else "pending"
-        
-        link_text = f'<a href="{idea["link"]}" target="_blank">Link</a>' if idea.get('link') else 'N/A'
-        
-        html_content += f"""
-                <tr>
-                    <td>{idea['id']}</td>
-                    <td><span class="tag">{idea['tag']}</span></td>
-                    <td>{idea['text']}</td>
-                    <td>{link_text}</td>
-                    <td>{idea['submitter']}</td>
-                    <td>{idea['submitted_at'][:10]}</td>
-                    <td>{reviews_text}</td>
-                    <td class="{status_class}">{status}</td>
-                </tr>
-        """
-    
-    html_content += """
+    """.encode('utf-8'))
+    html_content += rows
+    html_content += b"""
             </tbody>
         </table>
     </body>
     </html>
     """
     
-    return html_content
+    return bytes(html_content)
 
 def show_leaderboard():
-    points = load_json('points.json')
+    points = load_points()
     
     if not points:
         st.info("No points recorded yet.")
@@ -297,8 +524,12 @@ def show_leaderboard():
     
     st.subheader("🏆 Points Leaderboard")
     
-    # Sort by points descending
-    sorted_users = sorted(points.items(), key=lambda x: x[1], reverse=True)
+    # Only the top entries are shown by default, so select them with a bounded heap
+    top_k = st.number_input("Show top", min_value=3, max_value=100, value=10, step=1, key="leaderboard_top_k")
+    if st.checkbox("Show all", key="leaderboard_show_all"):
+        sorted_users = sorted(points.items(), key=lambda x: x[1], reverse=True)
+    else:
+        sorted_users = heapq.nlargest(int(top_k), points.items(), key=lambda x: x[1])
     
     for i, (user, user_points) in enumerate(sorted_users):
         if i == 0:
@@ -336,10 +567,7 @@ def main():
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"ideas_{timestamp}.html"
             
-            # Save to disk first
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
+            # Served straight from memory as the already-encoded report bytes
             st.download_button(
                 label="Download Report",
                 data=html_content,